@@ -1,33 +1,74 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import time
+START_TIME = time.perf_counter() # Reference point of the --verbose startup timings (before the heavy imports)
+import argparse
+import threading
+import os
+import zipfile
+import importlib.util
+import re
+import json
+import functools
+import struct
+import zlib
+import socket
+import platform
+import tempfile
+from collections import deque
 import numpy as np
 
-# --- Matplotlib Setup (Attempt backend setting early) ---
-MATPLOTLIB_AVAILABLE = True # Assume not available initially
-try:
-    import matplotlib
-    matplotlib.use('Qt5Agg') # Set the backend for PyQt5 compatibility
-    MATPLOTLIB_AVAILABLE = True
-    print("Matplotlib found and backend set to Qt5Agg.")
-except ImportError:
-    print("Warning: Matplotlib library not found. Plots will be disabled.")
+VERBOSE = False                  # Set by --verbose; enables the diagnostic prints
+
+def log(message):
+    """Prints a diagnostic message when running with --verbose."""
+    if VERBOSE: print(message)
+
+# --- Matplotlib (imported by load_matplotlib() when the first plot canvas is built) ---
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+_matplotlib_import_tried = False
+PLOT_BACKEND = 'matplotlib'      # 'matplotlib' or 'native' (NativePlotCanvas); set by --plot-backend
+
+# --- SciPy (optional: banded solver for the domain-wall relaxation, imported on first solve) ---
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+
+# --- Pillow (optional: animated GIF output of --export, imported by the export code) ---
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+# asyncio, multiprocessing and concurrent.futures are imported by the modes that use them
 
 # --- PyQt5 Imports (MUST come after backend setting if using matplotlib) ---
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSlider, QLabel,
                              QTabWidget, QGridLayout, QSizePolicy, QFrame, QRadioButton, QButtonGroup,
-                             QPushButton, QSpacerItem)
-from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QPolygonF, QFont, QPalette
-from PyQt5.QtCore import Qt, QTimer, QPointF, QRectF, pyqtSignal, QObject
-
-# --- Matplotlib Imports (conditional based on earlier check) ---
-if MATPLOTLIB_AVAILABLE:
-    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-    from matplotlib.figure import Figure
-    import matplotlib.ticker as mticker
-
-    # --- Define the REAL MplCanvas using Matplotlib ---
-    class MplCanvas(FigureCanvas):
+                             QPushButton, QSpacerItem, QComboBox, QCheckBox, QShortcut)
+from PyQt5.QtGui import (QPainter, QColor, QPen, QBrush, QPolygonF, QFont, QPalette, QImage, QPainterPath,
+                         QStaticText, QPixmap, QTransform, QKeySequence)
+from PyQt5 import sip
+from PyQt5.QtCore import (Qt, QTimer, QPointF, QRectF, QLineF, QSize, QEvent, QThread, pyqtSignal, QObject,
+                          QT_VERSION_STR)
+
+# --- Plot Canvases ---
+MplCanvas = None # The Matplotlib canvas class, defined by load_matplotlib()
+
+def load_matplotlib():
+    """Imports Matplotlib with the Qt5Agg backend on first use; returns MATPLOTLIB_AVAILABLE."""
+    global MATPLOTLIB_AVAILABLE, _matplotlib_import_tried, MplCanvas
+    if _matplotlib_import_tried:
+        return MATPLOTLIB_AVAILABLE
+    _matplotlib_import_tried = True
+    start = time.perf_counter()
+    try:
+        import matplotlib
+        matplotlib.use('Qt5Agg') # Set the backend for PyQt5 compatibility
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+    except ImportError:
+        MATPLOTLIB_AVAILABLE = False
+        print("Warning: Matplotlib library not found. Plots will use the native renderer.")
+        return False
+
+    class MatplotlibCanvas(FigureCanvas):
         """Matplotlib Canvas widget for embedding plots in PyQt."""
         def __init__(self, parent=None, width=5, height=4, dpi=100):
             self.fig = Figure(figsize=(width, height), dpi=dpi)
@@ -39,31 +80,21 @@ if MATPLOTLIB_AVAILABLE:
             FigureCanvas.updateGeometry(self)
             # Ensure tight layout is applied to the figure
             self.figure.set_tight_layout(True)
-else:
-    # --- Define a PLACEHOLDER MplCanvas if Matplotlib is missing ---
-    class MplCanvas(QWidget):
-        """Placeholder widget displayed when Matplotlib is not installed."""
-        axes = None # Dummy attribute expected by update methods
 
-        class DummyFigure: # Nested dummy class for the 'figure' attribute
-            def tight_layout(self, *args, **kwargs): pass # Dummy method
+        def paintEvent(self, event):
+            start = time.perf_counter()
+            super().paintEvent(event)
+            FrameProfiler.shared().record('paint', time.perf_counter() - start)
 
-        figure = DummyFigure() # Assign dummy figure instance
+    MplCanvas, MATPLOTLIB_AVAILABLE = MatplotlibCanvas, True
+    log(f"Matplotlib imported and backend set to Qt5Agg ({(time.perf_counter() - start) * 1e3:.0f} ms).")
+    return True
 
-        def __init__(self, parent=None, width=5, height=4, dpi=100):
-            super().__init__(parent)
-            layout = QVBoxLayout(self)
-            label = QLabel("Matplotlib not installed.\nPlotting is disabled.")
-            label.setAlignment(Qt.AlignCenter)
-            label.setStyleSheet("font-style: italic; color: gray;")
-            layout.addWidget(label)
-            # Set minimum size to prevent collapsing completely
-            self.setMinimumSize(int(width*dpi*0.7), int(height*dpi*0.7))
-            print("Created placeholder MplCanvas.")
-
-        def draw(self):
-            """Dummy draw method, does nothing."""
-            pass
+def make_canvas(parent=None, width=5, height=4, dpi=100):
+    """Creates a plot canvas for PLOT_BACKEND (Matplotlib on first use, else the native QPainter canvas)."""
+    if PLOT_BACKEND == 'native' or not load_matplotlib():
+        return NativePlotCanvas(parent, width=width, height=height, dpi=dpi)
+    return MplCanvas(parent, width=width, height=height, dpi=dpi)
 
 
 # =============================================================================
@@ -73,11 +104,84 @@ SPIN_ARROW_LENGTH = 25      # Visual length of spin arrows
 SPIN_ARROW_HEAD_SIZE = 6    # Size of arrowhead polygon
 GRID_SPACING = 40           # Default visual spacing for lattices/walls
 UPDATE_INTERVAL = 40        # Animation timer interval in milliseconds
+TARGET_FPS = 1000.0 / UPDATE_INTERVAL # Default frame rate of the shared animation clock
+MAX_FRAME_DT = 0.25         # Longest wall-clock gap (s) credited to a single frame
+PHYSICS_DT = UPDATE_INTERVAL / 1000.0 # Fixed simulation step (s), independent of the frame rate
+MAX_CATCHUP_STEPS = 5       # Most fixed steps run in one frame before lag is discarded
+WORKER_IDLE_AFTER = 0.5     # Seconds without a reader before a simulation worker idles
 PI = np.pi                  # Mathematical constant pi
+LLG_CHAIN_LENGTH = 32768    # Spins simulated behind the spin-chain tab (periodic chain)
+LLG_WAVE_AMPLITUDE = 0.2    # Transverse amplitude of a seeded spin wave
+LLG_MAX_PHASE_STEP = 0.5    # Largest precession angle (rad) per RK4 sub-step
+MC_LATTICE_SIZES = (64, 128, 256, 512, 1024) # Selectable L for the L×L Monte Carlo lattice
+MC_TRACE_LENGTH = 400       # Sweeps kept in the live M / E / χ traces
+MC_TRACE_REFRESH = 0.5      # Seconds between redraws of the trace plot
+ONSAGER_TC = 2.0 / np.log(1.0 + np.sqrt(2.0)) # Exact 2D Ising T_c in units of J/k_B
+FIELD_ARROW_GRID = 24       # Arrows per side of the optional overlay on field images
+CHAIN_STRIP_SPINS = 512     # Spins shown in the colour strip under the spin-chain arrows
+MU0 = 4e-7 * np.pi          # Vacuum permeability (T·m/A)
+DW_GRID_CELLS = 100000      # Cells of the 1D grid used by the domain-wall relaxation
+DW_PREVIEW_CELLS = 2000     # Cells of the coarse grid relaxed while a domain-wall slider is dragged
+DW_SATURATION_MS = 8.0e5    # Saturation magnetization (A/m) for the field and demag terms
+DW_DEMAG_FACTOR = 0.1       # Transverse demagnetizing factor N_y of the local demag approximation
+DW_NEWTON_TOL = 1e-10       # Newton stops once no cell moves by more than this (rad)
+DW_MAX_NEWTON_STEPS = 60    # Upper bound on Newton iterations per relaxation
+DW_EDGE_SLOPE_TOL = 1e-3    # Largest |θ'| at the pinned ends, relative to the core, before the grid is widened
+DW_MAX_WIDENINGS = 4        # Upper bound on grid doublings per relaxation
+SWEEP_CHUNK_SIZE = 1000000  # Grid points evaluated and written per chunk by --sweep
+SWEEP_PARALLEL_THRESHOLD = 20000000 # Grid size above which --sweep uses a process pool
+EXPORT_FRAMES_PER_TASK = 32 # Frames rendered per process-pool task by --export
+EXPORT_PNG_QUALITY = 80     # Qt PNG quality for exported frames (higher = faster, less zlib effort)
+EXPORT_GIF_COLORS = 64      # Palette size of exported GIF frames
+SQW_CHAIN_LENGTH = 256      # Spins in the periodic chain recorded for S(k, ω)
+SQW_WINDOW_SIZES = (128, 256, 512, 1024) # Selectable samples per S(k, ω) time window
+SQW_HISTORY = 1024          # Samples held in the trajectory ring buffer (at least the largest window)
+SQW_SAMPLES_PER_STEP = 8    # Trajectory samples recorded per worker step
+SQW_AVERAGES = 8            # Windows in the running average of |ψ(k, ω)|²
+SQW_NYQUIST_MARGIN = 1.25   # Nyquist frequency of the sampling as a multiple of the top magnon frequency
+SQW_NOISE_AMPLITUDE = 0.05  # Transverse noise that excites every mode of the recorded chain
+SQW_LOG_RANGE = 4.0         # Decades of S(k, ω) shown by the log-scale heat map
+MAGNON_BZ_POINTS = (4096, 256, 64) # k-points per axis of the 1D / 2D / 3D Brillouin-zone grids
+MAGNON_CORE_RADIUS = 4      # Grid spacings around k = 0 of the 3D zone replaced by a continuum ball
+MAGNON_CORE_NODES = 128     # Gauss-Legendre nodes of the radial integral over that ball
+MAGNON_T_POINTS = 400       # Temperatures on each cached thermodynamic curve
+MAGNON_T_MAX = 4.0          # Top of the temperature grid (units of J/k_B at J = 1)
+MAGNON_T_CHUNK = 50         # Temperatures evaluated per vectorized Bose-factor block
+MAGNON_CACHE_SIZE = 64      # (J, S, dimension) curve sets kept by the LRU cache
+ZETA = {1.5: 2.6123753487, 2.0: 1.6449340668, 2.5: 1.3414872573} # Riemann ζ at the spin-wave exponents
+BROADCAST_PORT = 8765       # Default TCP port of --serve / --view
+BROADCAST_FPS = 20          # State frames published per second by --serve
+BROADCAST_KEYFRAME_INTERVAL = 40 # Frames between full keyframes (new and lagging viewers resync on them)
+BROADCAST_SEND_BUFFER = 8192 # Kernel send buffer (bytes) of each viewer socket
+BROADCAST_HIGH_WATER = 8192 # Bytes queued for a viewer beyond the kernel buffer before its frames are dropped
+BROADCAST_RETRY_INTERVAL = 1.0 # Seconds between reconnection attempts of --view
+LOAD_TEST_SLOW_EVERY = 10   # Every n-th simulated --load-test client reads slowly
+LOAD_TEST_SLOW_READ_INTERVAL = 0.25 # Seconds a slow simulated client waits between reads
+LOAD_TEST_MAX_ENCODE_GROWTH = 2.0 # Allowed growth of encode CPU per frame from 1 viewer to the largest stage
+LOAD_TEST_MAX_VIEWER_US = 25.0 # Allowed marginal server CPU per viewer per frame (µs)
+PROFILE_WINDOW = 240        # Samples per series kept by the frame profiler
+BENCHMARK_SLIDER_STEPS = 40 # Values visited per slider by --benchmark
+BENCHMARK_FRAMES = 60       # Animation frames timed per --benchmark scenario
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
+def lerp_angle(a0, a1, alpha):
+    """Interpolates between two angles (radians) along the shorter arc."""
+    diff = (a1 - a0 + np.pi) % (2 * np.pi) - np.pi
+    return (a0 + alpha * diff) % (2 * np.pi)
+
+def magnon_dispersion(J, S, a, k):
+    """Ferromagnetic chain dispersion ħω(k) = 4JS sin²(ka/2); broadcasts over all arguments."""
+    return 4.0 * J * S * np.sin(np.multiply(k, a) / 2.0) ** 2
+
+def domain_wall_width(A, K):
+    """Bloch wall width δw = π√(A/K); ∞ where K ≈ 0 and NaN where A < 0. Broadcasts."""
+    A, K = np.asarray(A, dtype=float), np.asarray(K, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        width = np.where(K > 1e-9, PI * np.sqrt(np.abs(A) / np.where(K > 1e-9, K, 1.0)), np.inf)
+    return np.where(A >= 0, width, np.nan)
+
 def create_arrowhead(end_point, direction_vector, size):
     """Creates a QPolygonF representing an arrowhead."""
     norm = np.linalg.norm(direction_vector)
@@ -96,6 +200,1360 @@ class UpdateNotifier(QObject):
     """Simple QObject to emit a signal when an update is needed."""
     updated = pyqtSignal()
 
+class FixedTimestepLoop:
+    """Runs whole step_dt steps for the measured frame time; the leftover fraction is kept in alpha."""
+    def __init__(self, step_fn, step_dt=PHYSICS_DT, max_steps=MAX_CATCHUP_STEPS):
+        self.step_fn = step_fn
+        self.step_dt = step_dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, dt):
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.step_dt and steps < self.max_steps:
+            self.step_fn(self.step_dt)
+            self.accumulator -= self.step_dt
+            steps += 1
+        if self.accumulator >= self.step_dt:
+            self.accumulator %= self.step_dt # Over budget: drop the lag instead of catching up
+        self.alpha = self.accumulator / self.step_dt
+        return steps
+
+class FrameScheduler(QObject):
+    """Single shared timer that ticks the animations of on-screen widgets and stops when none are visible."""
+    _shared = None
+
+    def __init__(self, parent=None, fps=TARGET_FPS):
+        super().__init__(parent)
+        self.target_fps = float(fps)
+        self._clients = {}   # widget -> animate_step callback
+        self._last_tick = {} # widget -> monotonic time of its last tick
+        self._last_timer_tick = None # For the profiler's frame intervals
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    @classmethod
+    def shared(cls):
+        """Returns the application-wide scheduler, creating it on first use."""
+        if cls._shared is None:
+            cls._shared = cls(QApplication.instance())
+        return cls._shared
+
+    def set_target_fps(self, fps):
+        self.target_fps = max(1.0, float(fps))
+        if self._timer.isActive():
+            self._timer.start(self.interval_ms())
+
+    def interval_ms(self):
+        return max(1, int(round(1000.0 / self.target_fps)))
+
+    def start(self, widget, callback):
+        self._clients[widget] = callback
+        self._last_tick.pop(widget, None)
+        self.refresh()
+
+    def stop(self, widget):
+        self._clients.pop(widget, None)
+        self._last_tick.pop(widget, None)
+        self.refresh()
+
+    def is_running(self, widget):
+        return widget in self._clients
+
+    def watch_tabs(self, tabs):
+        """Re-evaluates visibility whenever the current tab of a QTabWidget changes."""
+        tabs.currentChanged.connect(lambda index: self.refresh())
+
+    def is_visible(self, widget):
+        window = widget.window()
+        return widget.isVisible() and not (window is not None and window.isMinimized())
+
+    def refresh(self):
+        """Starts the timer if any registered widget is visible, otherwise stops it."""
+        visible = False
+        for widget in self._clients:
+            if self.is_visible(widget):
+                visible = True
+            else:
+                self._last_tick.pop(widget, None) # Paused: restart dt from zero later
+        if visible and not self._timer.isActive():
+            self._last_timer_tick = None
+            self._timer.start(self.interval_ms())
+        elif not visible and self._timer.isActive():
+            self._timer.stop()
+
+    def _tick(self):
+        now = time.monotonic()
+        if self._last_timer_tick is not None:
+            FrameProfiler.shared().record_frame(now - self._last_timer_tick, self.interval_ms() / 1000.0)
+        self._last_timer_tick = now
+        any_visible = False
+        for widget, callback in list(self._clients.items()):
+            if widget not in self._clients: continue # Stopped by an earlier callback
+            if not self.is_visible(widget):
+                self._last_tick.pop(widget, None)
+                continue
+            any_visible = True
+            last = self._last_tick.get(widget)
+            dt = 0.0 if last is None else min(now - last, MAX_FRAME_DT)
+            self._last_tick[widget] = now
+            callback(dt)
+        if not any_visible:
+            self._timer.stop()
+
+class SnapshotBuffer:
+    """Triple buffer handing the newest worker-thread state to one GUI reader without copying."""
+    def __init__(self, shape, dtype=np.float64):
+        self._slots = [np.zeros(shape, dtype=dtype) for _ in range(3)]
+        self._meta = [None] * 3
+        self._back, self._ready, self._front = 0, 1, 2
+        self._fresh = False
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+        self.last_read = time.monotonic()
+
+    def back(self):
+        """The slot owned by the writer: fill it, then call publish()."""
+        return self._slots[self._back]
+
+    def publish(self, meta=None):
+        with self._lock:
+            self._meta[self._back] = meta
+            self._back, self._ready = self._ready, self._back
+            if self._fresh:
+                self.dropped += 1 # The frame being replaced was never read
+            self._fresh = True
+            self.published += 1
+
+    def latest(self):
+        """Returns (array, meta, is_new) for the newest complete frame; valid until the next call."""
+        with self._lock:
+            self.last_read = time.monotonic()
+            fresh = self._fresh
+            if fresh:
+                self._front, self._ready = self._ready, self._front
+                self._fresh = False
+        return self._slots[self._front], self._meta[self._front], fresh
+
+class SimulationWorker(QThread):
+    """Runs a simulation on its own thread; the GUI changes it only through submit() and reads it through latest()."""
+    def __init__(self, step_fn, snapshot_fn, shape, dtype=np.float64, step_dt=PHYSICS_DT, parent=None):
+        super().__init__(parent)
+        self.step_fn = step_fn
+        self.snapshot_fn = snapshot_fn
+        self.step_dt = step_dt
+        self.buffer = SnapshotBuffer(shape, dtype)
+        self._commands = deque()
+        self._running = False
+        self.publish()
+
+    def publish(self):
+        buffer = self.buffer
+        buffer.publish(self.snapshot_fn(buffer.back()))
+
+    def resize(self, shape, dtype=None):
+        """Replaces the snapshot buffer; call from a submitted command (or while stopped)."""
+        self.buffer = SnapshotBuffer(shape, dtype or self.buffer.back().dtype)
+
+    def submit(self, command):
+        """Runs command on the simulation thread between steps (immediately if stopped)."""
+        if self.isRunning():
+            self._commands.append(command)
+        else:
+            command()
+            self.publish()
+
+    def latest(self):
+        return self.buffer.latest()
+
+    def start_simulation(self):
+        if not self.isRunning():
+            self._running = True
+            self.buffer.last_read = time.monotonic()
+            self.start()
+
+    def stop_simulation(self):
+        self._running = False
+        self.wait()
+        while self._commands: # Apply anything submitted after the last step
+            self._commands.popleft()()
+        self.publish()
+
+    def run(self):
+        loop = FixedTimestepLoop(self.step_fn, self.step_dt)
+        last = time.monotonic()
+        while self._running:
+            changed = bool(self._commands)
+            while self._commands:
+                self._commands.popleft()()
+            now = time.monotonic()
+            if now - self.buffer.last_read > WORKER_IDLE_AFTER:
+                if changed: self.publish()
+                last = now # Resume without catching up on the idle time
+                time.sleep(self.step_dt)
+                continue
+            steps = loop.advance(now - last)
+            last = now
+            if steps or changed:
+                self.publish()
+            time.sleep(max(0.001, self.step_dt - loop.accumulator))
+
+class CoalescedUpdate(QObject):
+    """Collapses bursts of update requests into at most one call per frame (preview=True while a slider is dragged)."""
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.dirty = False
+        self._sliders = []
+        self._last_flush = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def track(self, slider):
+        """Routes a slider's value changes (and its release) through this updater."""
+        self._sliders.append(slider)
+        slider.valueChanged.connect(lambda value: self.request())
+        slider.sliderReleased.connect(self.request)
+
+    def sliders(self):
+        return list(self._sliders)
+
+    def dragging(self):
+        return any(slider.isSliderDown() for slider in self._sliders)
+
+    def request(self):
+        self.dirty = True
+        if not self._timer.isActive():
+            frame_s = FrameScheduler.shared().interval_ms() / 1000.0
+            wait_s = max(0.0, self._last_flush + frame_s - time.monotonic())
+            self._timer.start(int(wait_s * 1000))
+
+    def flush(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        self._last_flush = time.monotonic()
+        start = time.perf_counter()
+        self.callback(preview=self.dragging())
+        FrameProfiler.shared().record('update', time.perf_counter() - start)
+
+class FrameProfiler:
+    """Rolling 'frame', 'paint' and 'update' timings for the profiling overlay and --benchmark."""
+    _shared = None
+    SERIES = ('frame', 'paint', 'update')
+
+    def __init__(self, window=PROFILE_WINDOW):
+        self.enabled = False
+        self.samples = {name: deque(maxlen=window) for name in self.SERIES}
+        self.dropped = 0
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def reset(self):
+        for series in self.samples.values():
+            series.clear()
+        self.dropped = 0
+
+    def set_window(self, window):
+        """Keeps the last window samples per series (None: keep everything)."""
+        self.samples = {name: deque(maxlen=window) for name in self.SERIES}
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.samples[name].append(seconds)
+
+    def record_frame(self, interval, expected):
+        if self.enabled:
+            self.samples['frame'].append(interval)
+            if interval > 1.5 * expected:
+                self.dropped += int(round(interval / expected)) - 1
+
+    def percentiles(self, name, percents=(50, 95)):
+        """Percentiles of a series in milliseconds (NaN while empty)."""
+        values = np.asarray(self.samples[name]) * 1e3
+        return np.percentile(values, percents) if values.size else np.full(len(percents), np.nan)
+
+    def fps(self):
+        frames = self.samples['frame']
+        return len(frames) / sum(frames) if frames else float('nan')
+
+class ProfilerOverlay(QLabel):
+    """Corner readout of the FrameProfiler statistics; toggled with F12 (or --profile)."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: #9f9; font-family: monospace;"
+                           " font-size: 9pt; padding: 6px; border-radius: 4px;")
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        profiler = FrameProfiler.shared()
+        profiler.enabled = not self.isVisible()
+        if profiler.enabled:
+            profiler.reset()
+            self.refresh()
+            self.show()
+            self.raise_()
+            self._timer.start(500)
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def refresh(self):
+        profiler = FrameProfiler.shared()
+        paint50, paint95 = profiler.percentiles('paint')
+        update50, update95 = profiler.percentiles('update')
+        self.ensurePolished() # Size the label with the stylesheet font
+        self.setText(f"FPS      {profiler.fps():6.1f}\n"
+                     f"paint    {paint50:6.2f} ms  (p95 {paint95:.2f})\n"
+                     f"update   {update50:6.2f} ms  (p95 {update95:.2f})\n"
+                     f"dropped  {profiler.dropped:6d}")
+        self.adjustSize()
+        self.move(self.parentWidget().width() - self.width() - 12, 40)
+
+class StartupTimer(QObject):
+    """Records startup phases and logs them once the watched window has painted."""
+    def __init__(self, start_time=START_TIME):
+        super().__init__()
+        self.marks = [("start", start_time)]
+
+    def mark(self, name):
+        """Ends the phase called name at the current time."""
+        self.marks.append((name, time.perf_counter()))
+
+    def watch_first_paint(self, widget):
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, self.report) # Runs once the paint event has been handled
+        return False
+
+    def report(self):
+        self.mark("first paint")
+        phases = ", ".join(f"{name} {(end - begin) * 1e3:.0f} ms"
+                           for (_, begin), (name, end) in zip(self.marks, self.marks[1:]))
+        log(f"Startup: {phases} (total {(self.marks[-1][1] - self.marks[0][1]) * 1e3:.0f} ms)")
+
+# =============================================================================
+# Physics: Landau-Lifshitz-Gilbert Spin Chain
+# =============================================================================
+class LLGChain:
+    """Vectorized RK4 LLG integrator for a periodic 1D Heisenberg chain (ħ = γ = 1, easy axis z)."""
+    def __init__(self, num_spins=LLG_CHAIN_LENGTH, J=1.0, S=1.0, K=0.0, B=0.0, damping=0.0):
+        self.num_spins = int(num_spins)
+        self.J, self.S, self.K, self.B, self.damping = J, S, K, B, damping
+        self.m = np.zeros((3, self.num_spins))
+        self.m[2] = 1.0
+        self.time = 0.0
+        self.ka = 0.0
+        self.measured_omega = float('nan')
+        self._mode_phasor = None # exp(-i ka x) of the seeded wave
+        self._mode_amp = None    # Last complex amplitude of the seeded wave
+        # Work arrays reused by every RK4 stage
+        self._h = np.empty_like(self.m)
+        self._t = np.empty_like(self.m)
+        self._stage = np.empty_like(self.m)
+        self._k = [np.empty_like(self.m) for _ in range(4)]
+
+    def max_frequency(self):
+        return abs(4 * self.J * self.S) + abs(2 * self.K) + abs(self.B)
+
+    def analytic_omega(self, ka):
+        return 4 * self.J * self.S * np.sin(ka / 2.0)**2 + 2 * self.K + self.B
+
+    def seed_spin_wave(self, k_factor, amplitude=LLG_WAVE_AMPLITUDE):
+        """Starts a single wave with ka ≈ k_factor·π, snapped to a mode of the periodic chain."""
+        n = int(round(k_factor * self.num_spins / 2.0))
+        self.ka = 2 * PI * n / self.num_spins
+        phase = self.ka * np.arange(self.num_spins)
+        self.m[0] = amplitude * np.cos(phase)
+        self.m[1] = amplitude * np.sin(phase)
+        self.m[2] = np.sqrt(1.0 - amplitude**2)
+        self.time = 0.0
+        self._mode_phasor = np.exp(-1j * phase)
+        self._mode_amp = None
+        self.measured_omega = float('nan')
+        return self.ka
+
+    def seed_noise(self, amplitude=1e-3, seed=None):
+        """Tilts every spin by a small random transverse amount, exciting all modes at once."""
+        rng = np.random.default_rng(seed)
+        self.m[0] = amplitude * rng.standard_normal(self.num_spins)
+        self.m[1] = amplitude * rng.standard_normal(self.num_spins)
+        self.m[2] = 1.0
+        self._normalize()
+        self.time = 0.0
+        self._mode_phasor = None
+        self.measured_omega = float('nan')
+
+    def _cross(self, a, b, out):
+        np.multiply(a[1], b[2], out=out[0]); out[0] -= a[2] * b[1]
+        np.multiply(a[2], b[0], out=out[1]); out[1] -= a[0] * b[2]
+        np.multiply(a[0], b[1], out=out[2]); out[2] -= a[1] * b[0]
+        return out
+
+    def _rhs(self, m, out):
+        h = self._h
+        np.add(m[:, :-2], m[:, 2:], out=h[:, 1:-1]) # Nearest neighbours, periodic ends below
+        h[:, 0] = m[:, -1] + m[:, 1]
+        h[:, -1] = m[:, -2] + m[:, 0]
+        h *= self.J * self.S
+        h[2] += 2 * self.K * m[2] + self.B
+        torque = self._cross(m, h, self._t)
+        self._cross(m, torque, out)      # m × (m × H)
+        out *= self.damping
+        out += torque
+        out *= -1.0 / (1.0 + self.damping**2)
+        return out
+
+    def _rk4(self, h):
+        m, stage = self.m, self._stage
+        k1, k2, k3, k4 = self._k
+        self._rhs(m, k1)
+        np.multiply(k1, 0.5 * h, out=stage); stage += m
+        self._rhs(stage, k2)
+        np.multiply(k2, 0.5 * h, out=stage); stage += m
+        self._rhs(stage, k3)
+        np.multiply(k3, h, out=stage); stage += m
+        self._rhs(stage, k4)
+        k2 += k3
+        k2 *= 2.0
+        k1 += k2
+        k1 += k4
+        k1 *= h / 6.0
+        m += k1
+
+    def _normalize(self):
+        self.m /= np.sqrt(np.einsum('ij,ij->j', self.m, self.m))
+
+    def step(self, dt):
+        """Advances the chain by dt (simulation time units)."""
+        n_sub = max(1, int(np.ceil(dt * self.max_frequency() / LLG_MAX_PHASE_STEP)))
+        h = dt / n_sub
+        for _ in range(n_sub):
+            self._rk4(h)
+        self._normalize()
+        self.time += dt
+        if self._mode_phasor is not None and dt > 0:
+            amp = np.dot(self.m[0] + 1j * self.m[1], self._mode_phasor)
+            if self._mode_amp is not None and abs(amp) > 1e-12:
+                omega = np.angle(amp * np.conj(self._mode_amp)) / dt
+                prev = self.measured_omega
+                self.measured_omega = omega if np.isnan(prev) else 0.8 * prev + 0.2 * omega
+            self._mode_amp = amp
+
+    def measure_dispersion(self, num_spins=256, steps=256, amplitude=1e-3, seed=0):
+        """Measures ω(k) from the FFT phase rates of a small noise-seeded probe chain; returns (ka, ω) for 0 ≤ ka ≤ π."""
+        probe = LLGChain(num_spins, self.J, self.S, self.K, self.B, damping=0.0)
+        probe.seed_noise(amplitude, seed)
+        dt = LLG_MAX_PHASE_STEP / max(probe.max_frequency(), 1e-3)
+        prev = np.fft.fft(probe.m[0] + 1j * probe.m[1])
+        phase = np.zeros(num_spins)
+        for _ in range(steps):
+            probe.step(dt)
+            amp = np.fft.fft(probe.m[0] + 1j * probe.m[1])
+            phase += np.angle(amp * np.conj(prev))
+            prev = amp
+        half = num_spins // 2 + 1
+        ka = 2 * PI * np.arange(half) / num_spins
+        return ka, phase[:half] / (steps * dt)
+
+# =============================================================================
+# Physics: Dynamic Structure Factor
+# =============================================================================
+class StructureFactor:
+    """Sliding-window S(k, ω) of a noise-seeded LLGChain from Hann-tapered 2D FFTs of m_x + i m_y."""
+    def __init__(self, chain, window=SQW_WINDOW_SIZES[1]):
+        self.chain = chain
+        self.history = np.zeros((SQW_HISTORY, chain.num_spins), dtype=np.complex64)
+        self.recorded = 0 # Samples since the last clear; the ring head is recorded % SQW_HISTORY
+        self.set_window(window)
+        self.reset()
+
+    def set_window(self, window):
+        """Changes the window length; the spectrum is rebuilt from the recorded history."""
+        self.window = min(int(window), SQW_HISTORY)
+        self.taper = np.hanning(self.window)[:, None]
+        self._work = np.empty((self.window, self.chain.num_spins), dtype=np.complex128)
+        self.power = np.zeros((self.window // 2, self.chain.num_spins))
+        self.averaged = 0
+        self._since_update = 0
+        if self.recorded >= self.window:
+            self._update_spectrum()
+
+    def reset(self, seed=None):
+        """Re-seeds the chain with noise and discards the recorded trajectory."""
+        self.chain.seed_noise(SQW_NOISE_AMPLITUDE, seed)
+        self.clear()
+
+    def clear(self):
+        """Discards the trajectory and the spectrum, e.g. after J or S changed."""
+        self.sample_dt = PI / (SQW_NYQUIST_MARGIN * max(self.chain.max_frequency(), 1e-3))
+        self.recorded = 0
+        self.averaged = 0
+        self._since_update = 0
+        self.power[...] = 0.0
+
+    def set_params(self, J, S):
+        self.chain.J, self.chain.S = J, S
+        self.clear()
+
+    def ka(self):
+        """Wavevectors of the spectrum columns (units of 1/a), from -π to just below π."""
+        return np.fft.fftshift(2 * PI * np.fft.fftfreq(self.chain.num_spins))
+
+    def omega(self):
+        """Frequencies of the spectrum rows, from 0 to just below the Nyquist frequency."""
+        return 2 * PI * np.arange(self.window // 2) / (self.window * self.sample_dt)
+
+    def record(self):
+        """Appends the chain's current ψ to the ring buffer; updates the spectrum every half window."""
+        row = self.history[self.recorded % SQW_HISTORY]
+        row.real = self.chain.m[0]
+        row.imag = self.chain.m[1]
+        self.recorded += 1
+        self._since_update += 1
+        if self.recorded >= self.window and self._since_update >= self.window // 2:
+            self._update_spectrum()
+
+    def _update_spectrum(self):
+        head = self.recorded % SQW_HISTORY
+        start = head - self.window
+        work = self._work
+        if start >= 0:
+            work[...] = self.history[start:head]
+        else: # The window wraps around the end of the ring
+            work[:-start] = self.history[start:]
+            work[-start:] = self.history[:head]
+        work *= self.taper
+        spectrum = np.fft.fft2(work)[:self.window // 2] # Axes (t, x); ψ precesses at ω > 0
+        power = np.fft.fftshift(np.abs(spectrum)**2, axes=1)
+        power /= self.chain.num_spins * self.window
+        self.averaged += 1
+        self.power += (power - self.power) / min(self.averaged, SQW_AVERAGES)
+        self._since_update = 0
+
+    def step(self, step_dt):
+        """Worker step: records SQW_SAMPLES_PER_STEP samples, whatever the wall-clock step."""
+        for _ in range(SQW_SAMPLES_PER_STEP):
+            self.chain.step(self.sample_dt)
+            self.record()
+
+    def snapshot_shape(self):
+        return (self.window // 2, self.chain.num_spins)
+
+    def write_snapshot(self, out):
+        """Runs on the worker thread: copies the averaged spectrum into a buffer slot."""
+        out[...] = self.power
+        return (self.averaged, self.recorded, self.sample_dt, self.window, self.chain.J, self.chain.S)
+
+# =============================================================================
+# Physics: Magnon Thermodynamics
+# =============================================================================
+@functools.lru_cache(maxsize=None)
+def brillouin_zone_levels(dim):
+    """Distinct ε(k) = Σ_i (1 - cos k_i a) on the zone grid and their weights; in 3D the k ≈ 0 core is a continuum ball."""
+    L = MAGNON_BZ_POINTS[dim - 1]
+    axis_levels, axis_counts = np.unique(np.round(1.0 - np.cos(2 * PI * np.arange(L) / L), 12), return_counts=True)
+    levels, counts = np.zeros(1), np.ones(1)
+    for _ in range(dim):
+        sums = np.round(levels[:, None] + axis_levels[None, :], 12).ravel()
+        levels, inverse = np.unique(sums, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=(counts[:, None] * axis_counts[None, :]).ravel())
+    weights = counts / float(L)**dim
+    if dim != 3: # The 1D and 2D sums diverge with system size; there is no continuum limit to take
+        return levels[1:], weights[1:]
+    # Thermal magnons have k ~ √(T/JS), finer than the grid at low T: integrate the core as a continuum
+    core = levels < 0.5 * (MAGNON_CORE_RADIUS * 2 * PI / L)**2
+    k_core = np.cbrt(6 * PI**2 * weights[core].sum()) # Ball holding the same fraction of the zone
+    nodes, node_weights = np.polynomial.legendre.leggauss(MAGNON_CORE_NODES)
+    k = 0.5 * k_core * (nodes + 1.0)
+    ball_weights = node_weights * k_core * k**2 / (4 * PI**2) # 4πk² dk / (2π)³, dk = k_core/2 · d(node)
+    return np.concatenate((0.5 * k**2, levels[~core])), np.concatenate((ball_weights, weights[~core])) # ε ≈ k²a²/2
+
+@functools.lru_cache(maxsize=MAGNON_CACHE_SIZE)
+def magnon_thermodynamics(J, S, dim):
+    """Spin-wave (T, M/M(0), C) per spin of a dim-dimensional ferromagnet, as cached read-only arrays."""
+    levels, weights = brillouin_zone_levels(dim)
+    omega = 2 * J * S * levels
+    temperatures = np.linspace(MAGNON_T_MAX / MAGNON_T_POINTS, MAGNON_T_MAX, MAGNON_T_POINTS)
+    number = np.empty_like(temperatures)
+    heat_capacity = np.empty_like(temperatures)
+    with np.errstate(over='ignore'): # exp overflow → n_B = 0
+        for start in range(0, temperatures.size, MAGNON_T_CHUNK):
+            block = slice(start, start + MAGNON_T_CHUNK)
+            x = omega[None, :] / temperatures[block, None]
+            occupation = 1.0 / np.expm1(x)
+            number[block] = occupation @ weights
+            occupation *= occupation + 1.0
+            occupation *= x * x
+            heat_capacity[block] = occupation @ weights
+    magnetization = 1.0 - number / S
+    for array in (temperatures, magnetization, heat_capacity):
+        array.flags.writeable = False # Shared by every cache hit
+    return temperatures, magnetization, heat_capacity
+
+def magnon_low_temperature_laws(J, S, dim, T):
+    """Long-wavelength (ħω ≈ JS k²a²) limits: Bloch's ΔM/M(0) (3D only, else NaN) and C ∝ T^{d/2}."""
+    reduced = np.asarray(T, dtype=float) / (4 * PI * J * S)
+    bloch = ZETA[1.5] / S * reduced**1.5 if dim == 3 else np.full_like(reduced, np.nan)
+    heat_capacity = (dim / 2.0 + 1) * (dim / 2.0) * ZETA[dim / 2.0 + 1] * reduced**(dim / 2.0)
+    return bloch, heat_capacity
+
+# =============================================================================
+# Physics: Checkerboard Monte Carlo Lattice
+# =============================================================================
+class CheckerboardMonteCarlo:
+    """Checkerboard Metropolis / heat-bath sampler for a periodic L×L Ising or Heisenberg lattice."""
+    def __init__(self, size=128, model='ising', algorithm='metropolis', J=1.0, h=0.0, T=2.0, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.J, self.h, self.T = J, h, T
+        self.algorithm = algorithm
+        self.m_trace = np.zeros(MC_TRACE_LENGTH)   # Ring buffers of per-sweep observables
+        self.e_trace = np.zeros(MC_TRACE_LENGTH)
+        self.chi_trace = np.zeros(MC_TRACE_LENGTH)
+        self.set_lattice(size, model)
+
+    def set_lattice(self, size, model):
+        self.size, self.model = int(size) + int(size) % 2, model # Checkerboard needs even L
+        shape = (self.size, self.size // 2)
+        if model == 'ising':
+            self.sublattices = [self.rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=shape) for _ in range(2)]
+        else:
+            self.sublattices = [self._random_unit_vectors(shape) for _ in range(2)]
+        self._even_rows = (np.arange(self.size) % 2 == 0)[:, None]
+        self.reset_statistics()
+
+    def set_params(self, J=None, h=None, T=None):
+        """Changes couplings or temperature; the running averages restart."""
+        if J is not None: self.J = J
+        if h is not None: self.h = h
+        if T is not None: self.T = max(T, 1e-3)
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        self.sweeps = 0
+        self.num_samples = 0
+        self._sum_m = 0.0
+        self._sum_m2 = 0.0
+        for trace in (self.m_trace, self.e_trace, self.chi_trace): trace[:] = np.nan
+
+    def _random_unit_vectors(self, shape):
+        v = self.rng.standard_normal((3,) + shape).astype(np.float32)
+        v /= np.sqrt((v * v).sum(axis=0))
+        return v
+
+    def _neighbour_sum(self, colour):
+        """Sum of the four neighbours (all of the other colour) of every site of one colour."""
+        other = self.sublattices[1 - colour]
+        # Rows alternate which side the second horizontal neighbour sits on
+        shift = 1 if colour == 0 else -1
+        side = np.where(self._even_rows, np.roll(other, shift, axis=-1), np.roll(other, -shift, axis=-1))
+        return np.roll(other, 1, axis=-2) + np.roll(other, -1, axis=-2) + other + side
+
+    def _half_sweep_ising(self, colour):
+        beta = 1.0 / self.T
+        s = self.sublattices[colour]
+        local_field = self.J * self._neighbour_sum(colour) + self.h
+        r = self.rng.random(s.shape, dtype=np.float32)
+        if self.algorithm == 'heatbath':
+            p_up = 1.0 / (1.0 + np.exp(-2.0 * beta * local_field))
+            s[...] = np.where(r < p_up, 1.0, -1.0)
+        else:
+            dE = 2.0 * s * local_field
+            flip = (dE <= 0) | (r < np.exp(-beta * np.maximum(dE, 0)))
+            np.negative(s, out=s, where=flip)
+
+    def _half_sweep_heisenberg(self, colour):
+        beta = 1.0 / self.T
+        s = self.sublattices[colour]
+        field = self._neighbour_sum(colour)
+        field *= self.J
+        field[2] += self.h
+        step = min(1.0, 0.5 * np.sqrt(self.T)) # Proposal width shrinks as the lattice orders
+        trial = self.rng.standard_normal(s.shape, dtype=np.float32)
+        trial *= step
+        trial += s
+        trial /= np.sqrt((trial * trial).sum(axis=0))
+        dE = -((trial - s) * field).sum(axis=0)
+        r = self.rng.random(dE.shape, dtype=np.float32)
+        accept = (dE <= 0) | (r < np.exp(-beta * np.maximum(dE, 0)))
+        np.copyto(s, trial, where=accept)
+
+    def sweep(self, n=1):
+        """Runs n full sweeps (both sublattices) and records observables after each."""
+        half_sweep = self._half_sweep_ising if self.model == 'ising' else self._half_sweep_heisenberg
+        for _ in range(n):
+            half_sweep(0)
+            half_sweep(1)
+            self.sweeps += 1
+            self._record()
+
+    def lattice(self, out=None):
+        """Unpacks the two colours into a full (L, L) or (3, L, L) array (reusing out if it fits)."""
+        a, b = self.sublattices
+        shape = a.shape[:-1] + (self.size,)
+        full = out if out is not None and out.shape == shape else np.empty(shape, dtype=a.dtype)
+        full[..., 0::2, 0::2] = a[..., 0::2, :]
+        full[..., 1::2, 1::2] = a[..., 1::2, :]
+        full[..., 0::2, 1::2] = b[..., 0::2, :]
+        full[..., 1::2, 0::2] = b[..., 1::2, :]
+        return full
+
+    def magnetization(self):
+        """Magnetization per spin (Ising: signed; Heisenberg: length of the mean vector)."""
+        a, b = self.sublattices
+        if self.model == 'ising':
+            return float((a.mean() + b.mean()) / 2)
+        return float(np.linalg.norm((a.reshape(3, -1).mean(axis=1) + b.reshape(3, -1).mean(axis=1)) / 2))
+
+    def energy(self):
+        """Energy per spin; every bond has exactly one end on colour 0, so each is counted once."""
+        a, b = self.sublattices
+        bonds = (a * self._neighbour_sum(0)).sum()
+        zeeman = (a.sum() + b.sum()) if self.model == 'ising' else (a[2].sum() + b[2].sum())
+        return float((-self.J * bonds - self.h * zeeman) / self.size**2)
+
+    def _record(self):
+        m = abs(self.magnetization())
+        self.num_samples += 1
+        self._sum_m += m
+        self._sum_m2 += m * m
+        mean_m = self._sum_m / self.num_samples
+        chi = self.size**2 * (self._sum_m2 / self.num_samples - mean_m**2) / self.T
+        i = (self.sweeps - 1) % MC_TRACE_LENGTH
+        self.m_trace[i] = self.magnetization()
+        self.e_trace[i] = self.energy()
+        self.chi_trace[i] = chi
+
+    def traces(self):
+        """Returns (sweep numbers, M, E, χ) in chronological order."""
+        n = min(self.sweeps, MC_TRACE_LENGTH)
+        order = np.arange(self.sweeps - n, self.sweeps) % MC_TRACE_LENGTH
+        return (np.arange(self.sweeps - n, self.sweeps) + 1,
+                self.m_trace[order], self.e_trace[order], self.chi_trace[order])
+
+# =============================================================================
+# Physics: 1D Domain-Wall Relaxation
+# =============================================================================
+def _cyclic_reduction(a, b, c, d):
+    """Vectorized cyclic reduction; a[0] and c[-1] must be zero."""
+    n = b.size
+    if n == 1:
+        return d / b
+    pad = lambda v, edge: np.concatenate(([edge], v, [edge]))
+    ap, bp, cp, dp = pad(a, 0.0), pad(b, 1.0), pad(c, 0.0), pad(d, 0.0)
+    even = np.arange(0, n, 2) + 1 # Even rows, shifted by the padding
+    alpha = -ap[even] / bp[even - 1]
+    gamma = -cp[even] / bp[even + 1]
+    x = np.empty(n)
+    x[0::2] = _cyclic_reduction(alpha * ap[even - 1],
+                                bp[even] + alpha * cp[even - 1] + gamma * ap[even + 1],
+                                gamma * cp[even + 1],
+                                dp[even] + alpha * dp[even - 1] + gamma * dp[even + 1])
+    odd = np.arange(1, n, 2)
+    right = np.where(odd + 1 < n, x[np.minimum(odd + 1, n - 1)], 0.0)
+    x[1::2] = (d[odd] - a[odd] * x[odd - 1] - c[odd] * right) / b[odd]
+    return x
+
+def solve_tridiagonal(lower, diag, upper, rhs):
+    """Solves a tridiagonal system; lower/upper hold the n-1 off-diagonal entries."""
+    if SCIPY_AVAILABLE:
+        from scipy.linalg import solve_banded
+        banded = np.zeros((3, diag.size))
+        banded[0, 1:] = upper
+        banded[1] = diag
+        banded[2, :-1] = lower
+        return solve_banded((1, 1), banded, rhs, check_finite=False)
+    # Without SciPy: cyclic reduction, stable for the diagonally dominant Hessian
+    return _cyclic_reduction(np.concatenate(([0.0], lower)), diag,
+                             np.concatenate((upper, [0.0])), rhs)
+
+class DomainWallRelaxation:
+    """Newton minimizer for a 180° Bloch wall in a transverse field on a uniform 1D grid."""
+    def __init__(self, num_cells=DW_GRID_CELLS, Ms=DW_SATURATION_MS):
+        self.num_cells = num_cells
+        self.Ms = Ms
+        self.x = None
+        self.theta = None
+        self.length = None         # Decay length √(A/(K_eff(1 - h²))) of the stored profile
+        self.iterations = 0
+        self.warm_started = False
+        self.converged = False
+        self.saturated = False
+
+    def effective_anisotropy(self, K, demag=False):
+        """K plus the shape anisotropy of the local demag approximation (J/m³)."""
+        return K + (0.5 * MU0 * self.Ms ** 2 * DW_DEMAG_FACTOR if demag else 0.0)
+
+    def _energy(self, theta, A, K_eff, zeeman, dx):
+        return (A * np.sum(np.diff(theta) ** 2) / dx
+                + dx * np.sum(K_eff * np.sin(theta) ** 2 - zeeman * np.sin(theta)))
+
+    def relax(self, A, K, mu0_H=0.0, demag=False, half_width=None, warm_start=True):
+        """Relaxes the wall for A (J/m), K (J/m³) and μ0H_y (T); returns the Newton iterations used."""
+        K_eff = self.effective_anisotropy(K, demag)
+        zeeman = mu0_H * self.Ms
+        h = zeeman / (2.0 * K_eff)
+        if h >= 1.0: # Field beyond the anisotropy field: saturated along y, no wall
+            length = np.sqrt(A / K_eff)
+            half_width = half_width or 3.0 * PI * length
+            self.x = np.linspace(-half_width, half_width, self.num_cells)
+            self.theta, self.length = np.full(self.num_cells, PI / 2), length
+            self.iterations, self.converged, self.warm_started, self.saturated = 0, True, False, True
+            return 0
+        length = np.sqrt(A / (K_eff * (1.0 - h * h))) # Tails soften as the field approaches 2K_eff/Ms
+        half_width = max(half_width or 0.0, 3.0 * PI * length)
+        iterations = self._relax_on(A, K_eff, zeeman, h, length, half_width, warm_start)
+        warm_started = self.warm_started
+        for _ in range(DW_MAX_WIDENINGS):
+            if self.edge_slope() <= DW_EDGE_SLOPE_TOL: break
+            half_width *= 2.0 # Ends still pinned inside the wall: widen and refine
+            iterations += self._relax_on(A, K_eff, zeeman, h, length, half_width, True)
+        self.iterations, self.warm_started = iterations, warm_started
+        return iterations
+
+    def _relax_on(self, A, K_eff, zeeman, h, length, half_width, warm_start):
+        x = np.linspace(-half_width, half_width, self.num_cells)
+        dx = x[1] - x[0]
+        self.iterations = 0
+        right = np.arcsin(h)
+        left = PI - right
+        self.warm_started = warm_start and self.theta is not None and not self.saturated
+        self.saturated = False
+        if self.warm_started: # Previous profile, rescaled in x and in the domain angles
+            old_right = self.theta[-1]; old_left = self.theta[0]
+            fraction = (np.interp(x / length, self.x / self.length, self.theta) - old_right) / (old_left - old_right)
+            theta = right + fraction * (left - right)
+        else: # Cold start: straight ramp between the domains
+            theta = np.linspace(left, right, self.num_cells)
+        theta[0], theta[-1] = left, right
+        stiffness = 2.0 * A / dx
+        off = np.full(self.num_cells - 3, -stiffness)
+        energy = self._energy(theta, A, K_eff, zeeman, dx)
+        self.converged = False
+        for _ in range(DW_MAX_NEWTON_STEPS):
+            inner = theta[1:-1]
+            sin_t, cos_t = np.sin(inner), np.cos(inner)
+            grad = (stiffness * (2.0 * inner - theta[:-2] - theta[2:])
+                    + dx * (2.0 * K_eff * sin_t * cos_t - zeeman * cos_t))
+            local = 2.0 * K_eff * (cos_t ** 2 - sin_t ** 2) + zeeman * sin_t
+            step = solve_tridiagonal(off, 2.0 * stiffness + dx * local, off, -grad)
+            if np.dot(grad, step) >= 0: # Hessian indefinite far from the minimum: drop negative curvature
+                step = solve_tridiagonal(off, 2.0 * stiffness + dx * np.maximum(local, 0.0), off, -grad)
+            step *= min(1.0, 0.5 / max(np.abs(step).max(), 1e-300)) # At most 0.5 rad per cell
+            self.iterations += 1
+            scale = 1.0
+            while scale > 1e-6:
+                trial = theta.copy()
+                trial[1:-1] += scale * step
+                trial_energy = self._energy(trial, A, K_eff, zeeman, dx)
+                if trial_energy <= energy + 1e-12 * abs(energy):
+                    break
+                scale *= 0.5
+            theta, energy = trial, trial_energy
+            if scale * np.abs(step).max() < DW_NEWTON_TOL:
+                self.converged = True
+                break
+        self.x, self.theta, self.length = x, theta, length
+        return self.iterations
+
+    def edge_slope(self):
+        """|θ'| at the pinned ends relative to its maximum; ~0 when the grid holds the whole wall."""
+        slopes = np.abs(np.diff(self.theta))
+        return max(slopes[0], slopes[-1]) / slopes.max() if slopes.max() > 0 else 0.0
+
+    def wall_width(self):
+        """Lilley width π/|θ'|max of the relaxed profile (m); equals π√(A/K) at H = 0."""
+        if self.theta is None:
+            return float('nan')
+        slope = np.abs(np.diff(self.theta)).max() / (self.x[1] - self.x[0])
+        return PI / slope if slope > 0 else float('inf')
+
+    def profile(self, num_points=None):
+        """Returns (x, m_y, m_z), optionally decimated to about num_points samples."""
+        stride = max(1, self.num_cells // num_points) if num_points else 1
+        theta = self.theta[::stride]
+        return self.x[::stride], np.sin(theta), np.cos(theta)
+
+# =============================================================================
+# Rendering: Spin Field Images
+# =============================================================================
+def diverging_color_table():
+    """256-entry blue → white → red table for values in [-1, 1] (e.g. m_z)."""
+    t = np.linspace(-1.0, 1.0, 256)
+    r = np.where(t < 0, 1.0 + t, 1.0)
+    g = 1.0 - np.abs(t)
+    b = np.where(t > 0, 1.0 - t, 1.0)
+    rgb = (np.stack([r, g, b]) * 0.85 + 0.15) * 255 # Keep both ends away from pure black
+    return [0xFF000000 | (int(rv) << 16) | (int(gv) << 8) | int(bv) for rv, gv, bv in rgb.T]
+
+def sequential_color_table():
+    """256-entry dark purple → orange → pale yellow table (magma-like) for intensities."""
+    anchors = np.array([(0, 0, 4), (80, 18, 123), (182, 54, 121), (251, 136, 97), (252, 253, 191)], dtype=float)
+    t = np.linspace(0.0, 1.0, 256)
+    rgb = [np.interp(t, np.linspace(0.0, 1.0, len(anchors)), channel) for channel in anchors.T]
+    return [0xFF000000 | (int(rv) << 16) | (int(gv) << 8) | int(bv) for rv, gv, bv in zip(*rgb)]
+
+def cyclic_color_table():
+    """256-entry hue wheel for angles in [0, 2π)."""
+    return [QColor.fromHsvF(i / 256.0, 0.85, 0.95).rgb() for i in range(256)]
+
+class SpinFieldRenderer:
+    """Draws a 2D field of m_z values or spin angles as an indexed QImage, one pixel per spin."""
+    def __init__(self, mode='mz'):
+        self.arrows = False
+        self.arrow_color = QColor(20, 20, 20, 200)
+        self._buffer = None # Row-padded uint8 pixels wrapped by self._image
+        self._scratch = None
+        self._image = None
+        self._vectors = None
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        """'mz' maps [-1, 1] through a diverging table; 'angle' maps radians through a hue wheel."""
+        self.mode = mode
+        self.color_table = cyclic_color_table() if mode == 'angle' else diverging_color_table()
+        if self._image is not None: self._image.setColorTable(self.color_table)
+
+    def _ensure_buffer(self, height, width):
+        if self._buffer is None or self._buffer.shape[0] != height or self._scratch.shape[1] != width:
+            stride = (width + 3) & ~3 # QImage scan lines must be 32-bit aligned
+            self._buffer = np.zeros((height, stride), dtype=np.uint8)
+            self._scratch = np.empty((height, width), dtype=np.float32)
+            # Wrap the raw pointer: Qt treats buffer-protocol data as read-only and would copy it on setColorTable
+            self._image = QImage(sip.voidptr(self._buffer.ctypes.data), width, height, stride, QImage.Format_Indexed8)
+            self._image.setColorTable(self.color_table)
+
+    def set_field(self, values, vectors=None):
+        """Quantizes a (H, W) field into the image; vectors=(vx, vy) feeds the arrow overlay."""
+        height, width = values.shape
+        self._ensure_buffer(height, width)
+        scratch = self._scratch
+        if self.mode == 'angle':
+            np.mod(values, 2 * PI, out=scratch)
+            scratch *= 256.0 / (2 * PI)
+        else:
+            np.add(values, 1.0, out=scratch)
+            scratch *= 127.999
+        np.clip(scratch, 0, 255, out=scratch)
+        self._buffer[:, :width] = scratch # Cast to uint8 in place
+        self._vectors = vectors
+        return self._image
+
+    def paint(self, painter, target):
+        """Draws the current image scaled into target (a QRectF), plus optional arrows."""
+        if self._image is None: return
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False) # Keep individual spins crisp
+        painter.drawImage(target, self._image)
+        if self.arrows and self._vectors is not None:
+            self._paint_arrows(painter, target)
+        painter.restore()
+
+    def _paint_arrows(self, painter, target):
+        vx, vy = self._vectors
+        height, width = vx.shape
+        step = max(1, int(np.ceil(max(height, width) / FIELD_ARROW_GRID)))
+        rows = np.arange(step // 2, height, step)
+        cols = np.arange(step // 2, width, step)
+        sub_x, sub_y = vx[np.ix_(rows, cols)], vy[np.ix_(rows, cols)]
+        cell_w, cell_h = target.width() / width, target.height() / height
+        half = 0.45 * step * min(cell_w, cell_h)
+        cx = target.left() + (cols + 0.5) * cell_w
+        cy = target.top() + (rows + 0.5) * cell_h
+        painter.setPen(QPen(self.arrow_color, 1.5))
+        painter.setBrush(QBrush(self.arrow_color))
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        for r, y in enumerate(cy):
+            for c, x in enumerate(cx):
+                d = np.array([sub_x[r, c], -sub_y[r, c]]) # Screen y points down
+                end = np.array([x, y]) + d * half
+                painter.drawLine(QLineF(x - d[0] * half, y - d[1] * half, end[0], end[1]))
+                if np.hypot(*d) > 0.2:
+                    painter.drawPolygon(create_arrowhead(end, d, SPIN_ARROW_HEAD_SIZE * 0.6))
+
+# =============================================================================
+# Rendering: Native Plot Canvas
+# =============================================================================
+PLOT_COLOR_CODES = {'b': 'blue', 'g': 'green', 'r': 'red', 'c': 'cyan', 'm': 'magenta', 'y': 'yellow', 'k': 'black', 'w': 'white'}
+PLOT_LINESTYLES = {'-': Qt.SolidLine, '--': Qt.DashLine, ':': Qt.DotLine, '-.': Qt.DashDotLine}
+PLOT_MARKERS = 'o*.x+s'
+
+def polyline_path(x, y):
+    """Builds a QPainterPath through the points (x, y); non-finite points break the line."""
+    x, y = np.broadcast_arrays(np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float)))
+    path = QPainterPath()
+    finite = np.isfinite(x) & np.isfinite(y)
+    for segment in np.split(np.arange(x.size), np.flatnonzero(np.diff(finite.astype(np.int8))) + 1):
+        if segment.size < 2 or not finite[segment[0]]:
+            continue
+        polygon = QPolygonF(segment.size)
+        buffer = polygon.data()
+        buffer.setsize(segment.size * 16) # Two float64 per QPointF, filled in place
+        np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[...] = np.column_stack((x[segment], y[segment]))
+        path.addPolygon(polygon)
+    return path
+
+def marker_path(marker, size):
+    """Marker outline centred on the origin, size in pixels."""
+    path = QPainterPath()
+    r = size / 2.0
+    if marker == '*':
+        angles = PI / 2 + np.arange(10) * PI / 5
+        radii = np.where(np.arange(10) % 2 == 0, r * 1.2, r * 0.5)
+        path.addPolygon(QPolygonF([QPointF(rad * np.cos(t), -rad * np.sin(t)) for rad, t in zip(radii, angles)]))
+        path.closeSubpath()
+    elif marker == 'x':
+        path.moveTo(-r, -r); path.lineTo(r, r); path.moveTo(-r, r); path.lineTo(r, -r)
+    elif marker == '+':
+        path.moveTo(-r, 0); path.lineTo(r, 0); path.moveTo(0, -r); path.lineTo(0, r)
+    elif marker == 's':
+        path.addRect(QRectF(-r, -r, size, size))
+    else: # 'o' and the small point marker '.'
+        radius = r if marker == 'o' else max(1.5, r / 2.0)
+        path.addEllipse(QPointF(0, 0), radius, radius)
+    return path
+
+def nice_ticks(lo, hi, target=6):
+    """Tick positions at 1/2/2.5/5 × 10ⁿ steps covering [lo, hi]."""
+    raw = (hi - lo) / max(target, 1)
+    if not np.isfinite(raw) or raw <= 0:
+        return np.array([lo])
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    ticks = np.arange(np.ceil(lo / step), np.floor(hi / step) + 1) * step
+    return np.round(ticks, 12)
+
+def rich_label(text):
+    """Matplotlib mathtext sub- and superscripts ('m$_z$', 'T$^{3/2}$') as Qt rich text ('m<sub>z</sub>')."""
+    text = re.sub(r'\$_\{?(\w+)\}?\$', r'<sub>\1</sub>', text)
+    return re.sub(r'\$\^\{?([^${}]+)\}?\$', r'<sup>\1</sup>', text).replace('$', '')
+
+def parse_plot_format(fmt):
+    """Splits a Matplotlib format string such as 'g-.' or 'ro' into (colour name, marker, linestyle)."""
+    linestyle = next((style for style in ('--', '-.', '-', ':') if style in fmt), None) # Longest first: '-.' is no point marker
+    rest = fmt.replace(linestyle, '', 1) if linestyle else fmt
+    marker = next((char for char in rest if char in PLOT_MARKERS), None)
+    color = next((PLOT_COLOR_CODES[char] for char in rest if char in PLOT_COLOR_CODES), None)
+    return color, marker, linestyle
+
+class PlotLine:
+    """One plot() call: a cached path in data coordinates plus its pen and marker."""
+    def __init__(self, x, y, color, linestyle, linewidth, marker, markersize, mew, label):
+        self.x, self.y = np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float))
+        self.path = polyline_path(self.x, self.y) if linestyle else None
+        self.color = QColor(color)
+        self.pen = QPen(self.color, linewidth, PLOT_LINESTYLES.get(linestyle, Qt.SolidLine))
+        self.pen.setCosmetic(True) # Width in pixels despite the data transform
+        self.marker = marker
+        self.marker_path = marker_path(marker, markersize) if marker else None
+        self.marker_pen = QPen(self.color, mew)
+        self.label = label
+
+class NativeAxes:
+    """The subset of the Matplotlib Axes API used by the update_* methods, drawn with QPainter."""
+    def __init__(self, canvas, show_xticklabels=True):
+        self.canvas = canvas
+        self.show_xticklabels = show_xticklabels
+        self.clear()
+
+    def clear(self):
+        self.lines = []
+        self.image = None # (QImage, extent) from imshow
+        self.reference_lines = [] # (axis, value, pen, label) from axvline / axhline
+        self.title = self.xlabel = self.ylabel = ""
+        self.xlim = self.ylim = None
+        self.xticks = self.xticklabels = None
+        self.grid_on = False
+        self.legend_on = False
+
+    def plot(self, x, y, fmt='', color=None, label=None, linestyle=None, linewidth=1.5, markersize=6, mew=1.5, **kwargs):
+        fmt_color, marker, fmt_style = parse_plot_format(fmt)
+        if linestyle is None:
+            linestyle = fmt_style or (None if marker else '-')
+        color = color or fmt_color or 'blue'
+        self.lines.append(PlotLine(x, y, color, linestyle, linewidth, marker, markersize, mew, label))
+
+    def imshow(self, values, extent=None, origin='upper', vmin=None, vmax=None, **kwargs):
+        """Maps a 2D array through the sequential colour table onto extent (x0, x1, y0, y1)."""
+        values = np.asarray(values, dtype=np.float32)
+        height, width = values.shape
+        lo = float(np.nanmin(values)) if vmin is None else vmin
+        hi = float(np.nanmax(values)) if vmax is None else vmax
+        stride = (width + 3) & ~3 # QImage scan lines must be 32-bit aligned
+        pixels = np.zeros((height, stride), dtype=np.uint8)
+        scaled = np.nan_to_num((values - lo) * (255.999 / (hi - lo) if hi > lo else 0.0))
+        pixels[:, :width] = np.clip(scaled, 0, 255)[::-1] if origin == 'lower' else np.clip(scaled, 0, 255)
+        image = QImage(pixels.data, width, height, stride, QImage.Format_Indexed8)
+        image.setColorTable(self.canvas.image_color_table)
+        self.image = (image.copy(), extent or (-0.5, width - 0.5, -0.5, height - 0.5)) # copy() owns its pixels
+
+    def _reference_line(self, axis, value, color, linestyle, label):
+        pen = QPen(QColor(color), 1, PLOT_LINESTYLES.get(linestyle, Qt.SolidLine))
+        pen.setCosmetic(True)
+        self.reference_lines.append((axis, float(value), pen, label))
+
+    def axvline(self, x, color='gray', linestyle='-', label=None, **kwargs):
+        self._reference_line('x', x, color, linestyle, label)
+
+    def axhline(self, y, color='gray', linestyle='-', label=None, **kwargs):
+        self._reference_line('y', y, color, linestyle, label)
+
+    def set_title(self, text): self.title = text
+    def set_xlabel(self, text): self.xlabel = text
+    def set_ylabel(self, text): self.ylabel = text
+    def set_xlim(self, lo, hi): self.xlim = (float(lo), float(hi))
+    def set_ylim(self, lo, hi): self.ylim = (float(lo), float(hi))
+    def set_xticks(self, ticks): self.xticks = np.asarray(ticks, dtype=float)
+    def set_xticklabels(self, labels): self.xticklabels = list(labels)
+    def grid(self, visible=True, **kwargs): self.grid_on = visible
+    def legend(self, **kwargs): self.legend_on = True
+
+    def view_limits(self):
+        """(x0, x1, y0, y1): explicit limits, else the data range plus a 5 % margin."""
+        limits = []
+        for index, explicit in ((0, self.xlim), (1, self.ylim)):
+            if explicit is not None:
+                limits.extend(explicit)
+                continue
+            values = [line.y if index else line.x for line in self.lines]
+            values += [np.array([value]) for axis, value, _, _ in self.reference_lines if axis == 'xy'[index]]
+            if self.image is not None: values.append(np.array(self.image[1][2 * index:2 * index + 2], dtype=float))
+            values = np.concatenate(values) if values else np.array([])
+            values = values[np.isfinite(values)]
+            lo, hi = (values.min(), values.max()) if values.size else (0.0, 1.0)
+            margin = 0.05 * (hi - lo) if hi > lo else 0.5
+            limits.extend((lo - margin, hi + margin))
+        return tuple(limits)
+
+    def tick_labels(self, x0, x1, y0, y1):
+        """((x positions, x labels), (y positions, y labels)) inside the view."""
+        if self.xticks is not None:
+            xticks = self.xticks
+            xlabels = self.xticklabels or [f"{tick + 0.0:g}" for tick in xticks]
+        else:
+            xticks = nice_ticks(x0, x1)
+            xlabels = [f"{tick + 0.0:g}" for tick in xticks]
+        yticks = nice_ticks(y0, y1, 5)
+        return (xticks, xlabels), (yticks, [f"{tick + 0.0:g}" for tick in yticks])
+
+    def decoration_key(self, rect, limits):
+        """Everything the cached background of this axes depends on."""
+        xticks = None if self.xticks is None else tuple(self.xticks)
+        return (rect.getRect(), limits, self.title, self.xlabel, self.ylabel, self.grid_on,
+                xticks, None if self.xticklabels is None else tuple(self.xticklabels), self.show_xticklabels)
+
+    def transform(self, rect, limits):
+        """QTransform from data coordinates to the pixels of rect."""
+        x0, x1, y0, y1 = limits
+        sx = rect.width() / (x1 - x0) if x1 != x0 else 1.0
+        sy = rect.height() / (y1 - y0) if y1 != y0 else 1.0
+        return QTransform(sx, 0, 0, -sy, rect.left() - x0 * sx, rect.bottom() + y0 * sy)
+
+    def paint_background(self, painter, rect, limits):
+        """Frame, grid, ticks and labels; drawn once into the canvas's cached pixmap."""
+        canvas = self.canvas
+        transform = self.transform(rect, limits)
+        (xticks, xlabels), (yticks, ylabels) = self.tick_labels(*limits)
+        painter.fillRect(rect, Qt.white)
+        for ticks, labels, vertical in ((xticks, xlabels, True), (yticks, ylabels, False)):
+            for tick, label in zip(ticks, labels):
+                point = transform.map(QPointF(tick, tick))
+                if vertical and rect.left() - 0.5 <= point.x() <= rect.right() + 0.5:
+                    if self.grid_on:
+                        painter.setPen(canvas.grid_pen)
+                        painter.drawLine(QPointF(point.x(), rect.top()), QPointF(point.x(), rect.bottom()))
+                    painter.setPen(canvas.axis_pen)
+                    painter.drawLine(QPointF(point.x(), rect.bottom()), QPointF(point.x(), rect.bottom() + 4))
+                    if self.show_xticklabels:
+                        text = canvas.static_text(label)
+                        painter.drawStaticText(QPointF(point.x() - text.size().width() / 2, rect.bottom() + 5), text)
+                elif not vertical and rect.top() - 0.5 <= point.y() <= rect.bottom() + 0.5:
+                    if self.grid_on:
+                        painter.setPen(canvas.grid_pen)
+                        painter.drawLine(QPointF(rect.left(), point.y()), QPointF(rect.right(), point.y()))
+                    painter.setPen(canvas.axis_pen)
+                    painter.drawLine(QPointF(rect.left() - 4, point.y()), QPointF(rect.left(), point.y()))
+                    text = canvas.static_text(label)
+                    painter.drawStaticText(QPointF(rect.left() - 6 - text.size().width(), point.y() - text.size().height() / 2), text)
+        painter.setPen(canvas.axis_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(rect)
+        if self.title:
+            text = canvas.static_text(self.title, bold=True)
+            painter.drawStaticText(QPointF(rect.center().x() - text.size().width() / 2, rect.top() - text.size().height() - 4), text)
+        if self.xlabel and self.show_xticklabels:
+            text = canvas.static_text(self.xlabel)
+            painter.drawStaticText(QPointF(rect.center().x() - text.size().width() / 2, rect.bottom() + 20), text)
+        if self.ylabel:
+            text = canvas.static_text(self.ylabel)
+            painter.save()
+            painter.translate(rect.left() - 46, rect.center().y() + text.size().width() / 2)
+            painter.rotate(-90)
+            painter.drawStaticText(QPointF(0, 0), text)
+            painter.restore()
+
+    def paint_data(self, painter, rect, limits):
+        """Lines, reference lines, markers and the legend; drawn every frame."""
+        transform = self.transform(rect, limits)
+        painter.save()
+        painter.setClipRect(rect)
+        painter.setBrush(Qt.NoBrush)
+        if self.image is not None:
+            image, (x0, x1, y0, y1) = self.image
+            painter.drawImage(transform.mapRect(QRectF(x0, y0, x1 - x0, y1 - y0)), image)
+        for axis, value, pen, _ in self.reference_lines:
+            painter.setPen(pen)
+            point = transform.map(QPointF(value, value))
+            if axis == 'x': painter.drawLine(QPointF(point.x(), rect.top()), QPointF(point.x(), rect.bottom()))
+            else: painter.drawLine(QPointF(rect.left(), point.y()), QPointF(rect.right(), point.y()))
+        painter.setTransform(transform, True)
+        for line in self.lines:
+            if line.path is not None:
+                painter.setPen(line.pen)
+                painter.drawPath(line.path)
+        painter.resetTransform()
+        for line in self.lines:
+            if line.marker_path is None:
+                continue
+            painter.setPen(line.marker_pen)
+            painter.setBrush(QBrush(line.color) if line.marker not in 'x+' else Qt.NoBrush)
+            for x, y in zip(line.x, line.y):
+                if np.isfinite(x) and np.isfinite(y):
+                    point = transform.map(QPointF(x, y))
+                    painter.drawPath(line.marker_path.translated(point))
+        painter.restore()
+        if self.legend_on:
+            self.paint_legend(painter, rect)
+
+    def paint_legend(self, painter, rect):
+        entries = [(line.pen if line.path is not None else None, line, line.label) for line in self.lines if line.label]
+        entries += [(pen, None, label) for _, _, pen, label in self.reference_lines if label]
+        if not entries:
+            return
+        texts = [self.canvas.static_text(rich_label(label), rich=True) for _, _, label in entries]
+        row = max(text.size().height() for text in texts) + 2
+        width = 34 + max(text.size().width() for text in texts)
+        box = QRectF(rect.right() - width - 8, rect.top() + 6, width, row * len(entries) + 6)
+        painter.setPen(QPen(QColor(200, 200, 200)))
+        painter.setBrush(QColor(255, 255, 255, 220))
+        painter.drawRect(box)
+        for index, ((pen, line, _), text) in enumerate(zip(entries, texts)):
+            y = box.top() + 3 + index * row + row / 2
+            if pen is not None:
+                painter.setPen(pen)
+                painter.drawLine(QPointF(box.left() + 5, y), QPointF(box.left() + 27, y))
+            if line is not None and line.marker_path is not None:
+                painter.setPen(line.marker_pen)
+                painter.setBrush(QBrush(line.color) if line.marker not in 'x+' else Qt.NoBrush)
+                painter.drawPath(line.marker_path.translated(QPointF(box.left() + 16, y)))
+            painter.setPen(Qt.black)
+            painter.drawStaticText(QPointF(box.left() + 31, y - text.size().height() / 2), text)
+
+class NativePlotCanvas(QWidget):
+    """QPainter plot canvas with the interface of MplCanvas (axes, figure, draw); axes and labels are cached in a pixmap."""
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._size_hint = QSize(int(width * dpi), int(height * dpi))
+        self.setMinimumSize(int(width * dpi * 0.5), int(height * dpi * 0.5))
+        self.axes = NativeAxes(self)
+        self.axes_list = [self.axes]
+        self.figure = self # The canvas also plays the Matplotlib figure role (subplots, tight_layout)
+        self.grid_pen = QPen(QColor(200, 200, 200), 1, Qt.DashLine)
+        self.axis_pen = QPen(QColor(60, 60, 60), 1)
+        self.image_color_table = sequential_color_table()
+        self.text_font = QFont(self.font().family(), 9)
+        self._texts = {}
+        self._background = None
+        self._background_key = None
+
+    def sizeHint(self):
+        return self._size_hint
+
+    def static_text(self, text, rich=False, bold=False):
+        """Cached QStaticText, so tick and legend labels are laid out only once."""
+        key = (text, rich, bold)
+        static = self._texts.get(key)
+        if static is None:
+            if len(self._texts) > 512: self._texts.clear()
+            static = QStaticText(text)
+            static.setTextFormat(Qt.RichText if rich else Qt.PlainText)
+            font = QFont(self.text_font)
+            font.setBold(bold)
+            static.prepare(QTransform(), font)
+            self._texts[key] = static
+        return static
+
+    def tight_layout(self, *args, **kwargs):
+        """Margins are fixed, so there is no layout pass to run."""
+
+    def delaxes(self, ax):
+        self.axes_list.remove(ax)
+
+    def subplots(self, nrows=1, ncols=1, sharex=False):
+        """Adds nrows stacked axes (one column); sharex shows x tick labels on the bottom one only."""
+        new_axes = [NativeAxes(self, show_xticklabels=not sharex or row == nrows - 1) for row in range(nrows)]
+        self.axes_list.extend(new_axes)
+        return new_axes if nrows > 1 else new_axes[0]
+
+    def draw(self):
+        self.update()
+
+    def axes_rects(self):
+        """Plot rectangles of the stacked axes, leaving room for labels."""
+        rects = []
+        height = self.height() / max(len(self.axes_list), 1)
+        for row, ax in enumerate(self.axes_list):
+            top = row * height + (26 if ax.title else 10)
+            bottom = (row + 1) * height - (42 if ax.show_xticklabels else 12)
+            rects.append(QRectF(64, top, max(self.width() - 78, 10), max(bottom - top, 10)))
+        return rects
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        rects = self.axes_rects()
+        limits = [ax.view_limits() for ax in self.axes_list]
+        key = (self.width(), self.height(), self.devicePixelRatioF(),
+               tuple(ax.decoration_key(rect, lim) for ax, rect, lim in zip(self.axes_list, rects, limits)))
+        if key != self._background_key:
+            ratio = self.devicePixelRatioF()
+            self._background = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            self._background.setDevicePixelRatio(ratio)
+            self._background.fill(Qt.white)
+            background_painter = QPainter(self._background)
+            background_painter.setFont(self.text_font)
+            for ax, rect, lim in zip(self.axes_list, rects, limits):
+                ax.paint_background(background_painter, rect, lim)
+            background_painter.end()
+            self._background_key = key
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.text_font)
+        for ax, rect, lim in zip(self.axes_list, rects, limits):
+            ax.paint_data(painter, rect, lim)
+        painter.end()
+        FrameProfiler.shared().record('paint', time.perf_counter() - start)
+
 # =============================================================================
 # Custom Widgets Base Class
 # =============================================================================
@@ -116,10 +1574,13 @@ class SpinWidget(QWidget):
         self.update()
 
     def paintEvent(self, event):
+        start = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.fillRect(self.rect(), self._background_color)
         self.draw_spins(painter)
+        painter.end()
+        FrameProfiler.shared().record('paint', time.perf_counter() - start)
 
     def draw_spins(self, painter): pass # Implemented by subclasses
 
@@ -135,10 +1596,10 @@ class TwoSpinWidget(SpinWidget):
         self.J = 1.0 
         self.S = 1.0
         self.animating = False
-        self.animation_timer = QTimer(self)
-        self.animation_timer.timeout.connect(self.animate_step)
         self.animation_angle_target = np.pi
-        self.animation_speed = 0.05
+        self.animation_speed = 0.05 # Radians per fixed physics step
+        self.prev_s2_angle_rad = 0
+        self.loop = FixedTimestepLoop(self.physics_step)
 
     def set_j(self, value): 
         self.J = value 
@@ -159,14 +1620,38 @@ class TwoSpinWidget(SpinWidget):
     
     def start_animation(self, target_angle_rad):
         self.animation_angle_target = target_angle_rad
+        self.prev_s2_angle_rad = self.s2_angle_rad
+        self.loop.reset()
         self.animating = True
-        self.animation_timer.start(UPDATE_INTERVAL)
+        FrameScheduler.shared().start(self, self.animate_step)
         
     def stop_animation(self):
         self.animating = False 
-        self.animation_timer.stop()
+        FrameScheduler.shared().stop(self)
         
-    def animate_step(self):
+    def animate_step(self, dt):
+        self.loop.advance(dt)
+        self.update()
+
+    def display_angle(self):
+        """Angle to draw: interpolated between physics steps while animating."""
+        if not self.animating:
+            return self.s2_angle_rad
+        return lerp_angle(self.prev_s2_angle_rad, self.s2_angle_rad, self.loop.alpha)
+
+    def export_state(self):
+        """Everything draw_spins needs for the current frame (picklable)."""
+        return (self.display_angle(), self.J, self.S)
+
+    def apply_export_state(self, state):
+        """Shows a frame captured by export_state, without animating."""
+        self.animating = False
+        self.s2_angle_rad, self.J, self.S = state
+
+    def physics_step(self, step_dt):
+        if not self.animating:
+            return
+        self.prev_s2_angle_rad = self.s2_angle_rad
         diff = self.animation_angle_target - self.s2_angle_rad
         while diff <= -np.pi: diff += 2 * np.pi
         while diff > np.pi: diff -= 2 * np.pi
@@ -177,11 +1662,9 @@ class TwoSpinWidget(SpinWidget):
         effective_step = step * energy_gradient_factor
         self.s2_angle_rad += effective_step 
         self.s2_angle_rad = self.s2_angle_rad % (2 * np.pi)
-        self.update()
         if abs(diff) < self.animation_speed / 2 :
             self.s2_angle_rad = self.animation_angle_target
             self.stop_animation()
-            self.update()
             
     def draw_spins(self, painter):
         w, h = self.width(), self.height()
@@ -198,7 +1681,8 @@ class TwoSpinWidget(SpinWidget):
         
         # Spin 2
         s2_start = np.array([center_x + separation / 2, center_y])
-        s2_dir = np.array([np.cos(self.s2_angle_rad), np.sin(self.s2_angle_rad)])
+        s2_angle_rad = self.display_angle()
+        s2_dir = np.array([np.cos(s2_angle_rad), np.sin(s2_angle_rad)])
         s2_end = s2_start + s2_dir * SPIN_ARROW_LENGTH
         painter.setPen(QPen(Qt.red, 2))
         painter.setBrush(QBrush(Qt.red))
@@ -206,21 +1690,21 @@ class TwoSpinWidget(SpinWidget):
         painter.drawPolygon(create_arrowhead(s2_end, s2_dir, SPIN_ARROW_HEAD_SIZE))
         painter.drawText(int(s2_start[0] + 10), int(s2_start[1] + 20), "S₂")
         # Angle Arc
-        angle_deg = np.degrees(self.s2_angle_rad)
+        angle_deg = np.degrees(s2_angle_rad)
         rect_size = SPIN_ARROW_LENGTH * 1.2
         rect = QRectF(s2_start[0] - rect_size/2, s2_start[1] - rect_size/2, rect_size, rect_size)
         painter.setPen(QPen(Qt.blue, 1, Qt.DashLine))
         painter.setBrush(Qt.NoBrush)
         painter.drawArc(rect.toRect(), 0 * 16, int(angle_deg * 16))
         theta_text = f"θ = {angle_deg:.1f}°"
-        label_angle = self.s2_angle_rad / 2
+        label_angle = s2_angle_rad / 2
         label_radius = rect_size * 0.6
         label_pos_x = s2_start[0] + label_radius * np.cos(label_angle)
         label_pos_y = s2_start[1] + label_radius * np.sin(label_angle)
         painter.setPen(Qt.blue)
         painter.drawText(int(label_pos_x), int(label_pos_y), theta_text)
         # Energy Label
-        energy = self.get_energy(self.s2_angle_rad)
+        energy = self.get_energy(s2_angle_rad)
         energy_text = f"E(θ) = {energy:.2f} (arb. units)"
         painter.setPen(Qt.darkGreen)
         painter.setFont(QFont("Arial", 10))
@@ -242,18 +1726,30 @@ class TwoSpinWidget(SpinWidget):
 # Tab 2: Spin Chain Wave Widget
 # =============================================================================
 class SpinChainWidget(SpinWidget):
-    """Widget to visualize a spin wave propagating along a 1D chain."""
+    """Widget showing a window of an LLG-simulated spin chain carrying a spin wave."""
+    omega_measured = pyqtSignal(float) # Emitted periodically with the solver's measured ω
+    MEASURE_EVERY = 12                 # Snapshots between omega_measured emissions
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.num_spins = 20
         self.a_pixels = GRID_SPACING
         self.k_val = 0.0
         self.omega_val = 0.0
+        self.k_factor = None
         self.time = 0.0
         self.animating = False
+        self.remote = False # Set on a --view client: frames come from apply_export_state, never from the local solver
         self.spin_color = QColor(Qt.blue)
-        self.animation_timer = QTimer(self)
-        self.animation_timer.timeout.connect(self.animate_step)
+        self.solver = LLGChain(LLG_CHAIN_LENGTH)
+        self.solver.seed_spin_wave(0.0)
+        # The solver runs on the worker thread and publishes the first CHAIN_STRIP_SPINS spins
+        self.worker = SimulationWorker(self.physics_step, self.write_snapshot, (3, CHAIN_STRIP_SPINS), parent=self)
+        self.snapshot, self.snapshot_meta, _ = self.worker.latest()
+        self.prev_window = self.snapshot[:, :self.num_spins].copy()
+        self._snapshot_time = time.monotonic()
+        self._snapshots_since_measure = 0
+        self.strip_renderer = SpinFieldRenderer('angle') # Precession phase of a longer stretch of chain
         self.setBackgroundColor(QColor("#F0FFF0"))
         self.setMinimumHeight(80)
 
@@ -262,23 +1758,90 @@ class SpinChainWidget(SpinWidget):
         self.omega_val = omega
         self.a_pixels = a_pixels
         self.update()
+
+    def set_chain_params(self, J, S, k_factor, damping):
+        """Updates the solver; a new k re-seeds the wave on the simulated chain."""
+        reseed = k_factor != self.k_factor
+        self.k_factor = k_factor
+        def apply():
+            self.solver.J, self.solver.S, self.solver.damping = J, S, damping
+            if reseed: self.solver.seed_spin_wave(k_factor)
+        self.worker.submit(apply)
+        self.update()
+
+    def reseed(self):
+        self.worker.submit(lambda: self.solver.seed_spin_wave(self.k_factor or 0.0))
+        self.update()
+
+    def write_snapshot(self, out):
+        """Runs on the worker thread: copies the displayed part of the chain into a buffer slot."""
+        out[...] = self.solver.m[:, :out.shape[1]]
+        return (self.solver.time, self.solver.measured_omega)
+
+    def poll_snapshot(self):
+        """Picks up the newest published frame; returns True if it is new."""
+        if self.remote:
+            return False
+        previous = self.snapshot[:, :self.num_spins].copy() # Before latest() hands this slot back to the writer
+        snapshot, meta, fresh = self.worker.latest()
+        if fresh:
+            self.prev_window[...] = previous
+            self.snapshot, self.snapshot_meta = snapshot, meta
+            self.time = meta[0]
+            self._snapshot_time = time.monotonic()
+        return fresh
+
+    def measured_omega(self):
+        self.poll_snapshot()
+        return self.snapshot_meta[1]
+
+    def set_num_spins(self, num_spins):
+        """Changes how many spins are drawn as arrows (at most CHAIN_STRIP_SPINS)."""
+        self.num_spins = min(int(num_spins), CHAIN_STRIP_SPINS)
+        self.prev_window = self.snapshot[:, :self.num_spins].copy()
+        self.update()
+
+    def window_state(self):
+        """The displayed spins: a view onto the start of the latest snapshot."""
+        return self.snapshot[:, :self.num_spins]
+
+    def export_state(self):
+        """Everything draw_spins needs for the current frame (picklable)."""
+        return (self.snapshot.copy(), self.snapshot_meta, self.a_pixels)
+
+    def apply_export_state(self, state):
+        """Shows a frame captured by export_state, without animating."""
+        self.animating = False
+        snapshot, self.snapshot_meta, self.a_pixels = state
+        self.snapshot = snapshot
+        self.time = self.snapshot_meta[0]
         
     def start_animation(self):
         if not self.animating:
-            self.time = 0.0
+            self.reseed()
             self.animating = True
-            self.animation_timer.start(UPDATE_INTERVAL)
+            self.worker.start_simulation()
+            FrameScheduler.shared().start(self, self.animate_step)
             
     def stop_animation(self):
         if self.animating:
             self.animating = False
-            self.animation_timer.stop()
+            FrameScheduler.shared().stop(self)
+            self.worker.stop_simulation()
             self.update()
             
-    def animate_step(self):
-        time_scale_factor = 0.5
-        self.time += (UPDATE_INTERVAL / 1000.0) * self.omega_val * time_scale_factor
+    def animate_step(self, dt):
+        if self.poll_snapshot():
+            self._snapshots_since_measure += 1
+            omega = self.snapshot_meta[1]
+            if self._snapshots_since_measure >= self.MEASURE_EVERY and np.isfinite(omega):
+                self._snapshots_since_measure = 0
+                self.omega_measured.emit(omega)
         self.update()
+
+    def physics_step(self, step_dt):
+        time_scale_factor = 0.5 # Simulation time units per second of wall-clock time
+        self.solver.step(step_dt * time_scale_factor)
         
     def draw_spins(self, painter):
         w, h = self.width(), self.height()
@@ -288,16 +1851,31 @@ class SpinChainWidget(SpinWidget):
         painter.setPen(QPen(self.spin_color, 2))
         painter.setBrush(QBrush(self.spin_color))
         max_angle_deviation = PI / 4
+        if not self.animating: self.poll_snapshot()
+        m_x = self.window_state()[0]
+        if self.animating: # Interpolate between the last two snapshots (drawing one step behind)
+            alpha = min(1.0, (time.monotonic() - self._snapshot_time) / self.worker.step_dt)
+            m_x = self.prev_window[0] + alpha * (m_x - self.prev_window[0])
+        # Tilt is shown relative to the seeded amplitude so damping visibly shrinks it
+        deviations = max_angle_deviation * np.clip(m_x / LLG_WAVE_AMPLITUDE, -1.0, 1.0)
         for i in range(self.num_spins):
             x_pos_visual = start_x + i * self.a_pixels
-            phase = self.k_val * x_pos_visual - self.time if self.animating else self.k_val * x_pos_visual
-            angle_deviation = max_angle_deviation * np.cos(phase)
+            angle_deviation = deviations[i]
             spin_angle_rad = -PI/2 + angle_deviation
             spin_start = np.array([x_pos_visual, center_y])
             spin_dir = np.array([np.cos(spin_angle_rad), np.sin(spin_angle_rad)])
             spin_end = spin_start + spin_dir * SPIN_ARROW_LENGTH
             painter.drawLine(int(spin_start[0]), int(spin_start[1]), int(spin_end[0]), int(spin_end[1]))
             painter.drawPolygon(create_arrowhead(spin_end, spin_dir, SPIN_ARROW_HEAD_SIZE))
+        # Colour strip of the in-plane precession phase along a longer stretch of the chain
+        strip = self.snapshot
+        self.strip_renderer.set_field(np.arctan2(strip[1], strip[0])[None, :])
+        strip_rect = QRectF(10, h - 30, w - 20, 12)
+        self.strip_renderer.paint(painter, strip_rect)
+        painter.setPen(Qt.darkGray)
+        painter.drawText(int(strip_rect.left()), int(strip_rect.top() - 4),
+                         f"Precession phase of spins 0-{strip.shape[1] - 1} of {self.solver.num_spins}"
+                         f"   (dropped frames: {self.worker.buffer.dropped})")
 
 # =============================================================================
 # Tab 3: Domain Wall Visualization Widget
@@ -364,13 +1942,97 @@ class DomainWallWidget(SpinWidget):
         painter.drawText(int(boundary_left_x - 10), int(center_y - tick_height - 5), "-δw")
         painter.drawText(int(boundary_right_x - 5), int(center_y - tick_height - 5), "+δw")
 
+# =============================================================================
+# Tab 4: Monte Carlo Lattice Widget
+# =============================================================================
+class LatticeWidget(SpinWidget):
+    """Widget showing a Monte Carlo lattice as an image (one pixel per spin)."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.simulation = CheckerboardMonteCarlo()
+        self.sweeps_per_frame = 1
+        self.animating = False
+        self.renderer = SpinFieldRenderer('mz')
+        self.snapshot_meta = None # Readout data of the frame on screen (the buffer has this one reader)
+        self.frame_drawn = UpdateNotifier() # Emitted when a new frame has been drawn
+        # Sweeps run on the worker thread, which publishes the unpacked lattice
+        self.worker = SimulationWorker(self.sweep_step, self.write_snapshot, self.snapshot_shape(),
+                                       dtype=np.float32, step_dt=1.0 / TARGET_FPS, parent=self)
+        self.setBackgroundColor(QColor("#202020"))
+        self.setMinimumHeight(200)
+
+    def snapshot_shape(self):
+        sim = self.simulation
+        return (sim.size, sim.size) if sim.model == 'ising' else (3, sim.size, sim.size)
+
+    def sweep_step(self, step_dt):
+        self.simulation.sweep(self.sweeps_per_frame)
+
+    def write_snapshot(self, out):
+        """Runs on the worker thread: unpacks the lattice into a buffer slot; the meta carries the readout."""
+        sim = self.simulation
+        sim.lattice(out=out)
+        initial = None if sim.sweeps else (sim.magnetization(), sim.energy()) # No trace yet
+        return sim.traces(), initial
+
+    def set_lattice(self, size, model):
+        def apply():
+            self.simulation.set_lattice(size, model)
+            self.worker.resize(self.snapshot_shape())
+        self.worker.submit(apply)
+        self.update()
+
+    def set_params(self, J, h, T, algorithm):
+        def apply():
+            self.simulation.algorithm = algorithm
+            if (J, h, T) != (self.simulation.J, self.simulation.h, self.simulation.T):
+                self.simulation.set_params(J=J, h=h, T=T)
+        self.worker.submit(apply)
+
+    def start_animation(self):
+        if not self.animating:
+            self.animating = True
+            self.worker.start_simulation()
+            FrameScheduler.shared().start(self, self.animate_step)
+
+    def stop_animation(self):
+        if self.animating:
+            self.animating = False
+            FrameScheduler.shared().stop(self)
+            self.worker.stop_simulation()
+
+    def animate_step(self, dt):
+        self.update()
+
+    def set_view(self, mode, arrows):
+        """mode 'mz' colours S^z; 'angle' colours the in-plane angle of Heisenberg spins."""
+        self.renderer.set_mode(mode)
+        self.renderer.arrows = arrows
+        self.update()
+
+    def draw_spins(self, painter):
+        lattice, self.snapshot_meta, fresh = self.worker.latest() # Once per paint; the readout reuses the meta
+        angle_mode = self.renderer.mode == 'angle'
+        if lattice.ndim == 2: # Ising
+            field = lattice * (PI / 2) if angle_mode else lattice # ±π/2: opposite hues
+            vectors = (np.zeros_like(lattice), lattice) if self.renderer.arrows else None
+        else:
+            sx, sy, sz = lattice
+            field = np.arctan2(sy, sx) if angle_mode else sz
+            vectors = (sx, sy)
+        self.renderer.set_field(field, vectors)
+        side = min(self.width(), self.height())
+        self.renderer.paint(painter, QRectF((self.width() - side) / 2, (self.height() - side) / 2, side, side))
+        if fresh: self.frame_drawn.updated.emit()
+
 # =============================================================================
 # Main Application Window
 # =============================================================================
 class ExchangeAnimator(QMainWindow):
     """Main application window holding the tabs and controls."""
-    def __init__(self):
+    def __init__(self, view_only=False):
         super().__init__()
+        self.view_only = view_only # A --view client: shows the streamed state and runs no local simulation
         self.setWindowTitle("Exchange Interaction Animator")
         self.setGeometry(50, 50, 1150, 900)
         self.central_widget = QWidget()
@@ -378,16 +2040,21 @@ class ExchangeAnimator(QMainWindow):
         self.layout = QVBoxLayout(self.central_widget)
         self.tabs = QTabWidget()
         self.layout.addWidget(self.tabs)
-        # Create tabs
-        self.tab1 = QWidget()
-        self.tabs.addTab(self.tab1, "1. Discrete Heisenberg")
-        self.setup_tab1()
-        self.tab2 = QWidget()
-        self.tabs.addTab(self.tab2, "2. Magnon Dispersion (1D)")
-        self.setup_tab2()
-        self.tab3 = QWidget()
-        self.tabs.addTab(self.tab3, "3. Continuum (Domain Wall)")
-        self.setup_tab3()
+        # Create tabs; their contents are built on first activation
+        self.tab_builders = {}
+        for name, title, builder in (("tab1", "1. Discrete Heisenberg", self.setup_tab1),
+                                     ("tab2", "2. Magnon Dispersion (1D)", self.setup_tab2),
+                                     ("tab3", "3. Continuum (Domain Wall)", self.setup_tab3),
+                                     ("tab4", "4. Monte Carlo (2D Lattice)", self.setup_tab4),
+                                     ("tab5", "5. Structure Factor S(k, ω)", self.setup_tab5),
+                                     ("tab6", "6. Magnon Thermodynamics", self.setup_tab6)):
+            setattr(self, name, QWidget())
+            self.tab_builders[self.tabs.addTab(getattr(self, name), title)] = builder
+        self.tabs.currentChanged.connect(self.ensure_tab_built)
+        self._first_paint_pending = True # The current tab is built once the empty window has painted
+        FrameScheduler.shared().watch_tabs(self.tabs) # Pause animations on hidden tabs
+        self.profiler_overlay = ProfilerOverlay(self)
+        QShortcut(QKeySequence("F12"), self, self.profiler_overlay.toggle)
         self.apply_stylesheet() # Apply styles after widgets are created
 
     def apply_stylesheet(self):
@@ -420,7 +2087,22 @@ class ExchangeAnimator(QMainWindow):
             QRadioButton { margin-right: 15px; } QCheckBox { margin-right: 15px; }
         """)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._first_paint_pending:
+            self._first_paint_pending = False
+            QTimer.singleShot(0, lambda: self.ensure_tab_built(self.tabs.currentIndex()))
+
     # --- Tab Setup Methods ---
+    def ensure_tab_built(self, index):
+        """Builds a tab's contents the first time it is shown."""
+        builder = self.tab_builders.pop(index, None)
+        if builder is None:
+            return
+        start = time.perf_counter()
+        builder()
+        log(f"Built tab '{self.tabs.tabText(index)}' in {(time.perf_counter() - start) * 1e3:.0f} ms.")
+
     def setup_tab1(self):
         """Sets up the layout and widgets for Tab 1 (Two-Spin Heisenberg)."""
         layout = QHBoxLayout(self.tab1)
@@ -458,10 +2140,10 @@ class ExchangeAnimator(QMainWindow):
         self.two_spin_widget = TwoSpinWidget()
         self.two_spin_widget.setBackgroundColor(QColor("#E0F2F7"))
         vis_layout.addWidget(self.two_spin_widget, 3)
-        # Use the MplCanvas class (either real or placeholder)
-        self.energy_plot_canvas = MplCanvas(self, width=5, height=2.5, dpi=100)
+        # Matplotlib or native plot canvas, depending on PLOT_BACKEND
+        self.energy_plot_canvas = make_canvas(self, width=5, height=2.5, dpi=100)
         vis_layout.addWidget(self.energy_plot_canvas, 2)
-        self.update_energy_plot() # Call update even for placeholder (does nothing if placeholder)
+        self.update_energy_plot()
         # Controls Frame
         controls_frame = QFrame()
         controls_frame.setObjectName("controlsFrame")
@@ -474,6 +2156,8 @@ class ExchangeAnimator(QMainWindow):
         self.j_slider.setMaximum(200)
         self.j_slider.setValue(int(self.two_spin_widget.J * 100))
         self.j_slider.valueChanged.connect(self.on_j_slider_change)
+        self.energy_plot_updater = CoalescedUpdate(self.update_energy_plot, self)
+        self.energy_plot_updater.track(self.j_slider)
         controls_group_layout.addWidget(self.j_slider, 1, 0, 1, 2)
         j_sign_group = QButtonGroup(self)
         fm_radio = QRadioButton("Force J > 0 (FM)")
@@ -495,6 +2179,7 @@ class ExchangeAnimator(QMainWindow):
         self.s_slider.setMaximum(50)
         self.s_slider.setValue(int(self.two_spin_widget.S * 10))
         self.s_slider.valueChanged.connect(self.on_s_slider_change)
+        self.energy_plot_updater.track(self.s_slider)
         controls_group_layout.addWidget(self.s_slider, 4, 0, 1, 2)
         s_info = QLabel("<i>(S scales energy magnitude)</i>")
         s_info.setStyleSheet("color: gray;")
@@ -506,6 +2191,7 @@ class ExchangeAnimator(QMainWindow):
         self.theta_slider.setMaximum(360)
         self.theta_slider.setValue(int(np.degrees(self.two_spin_widget.s2_angle_rad)))
         self.theta_slider.valueChanged.connect(self.on_theta_slider_change)
+        self.energy_plot_updater.track(self.theta_slider)
         controls_group_layout.addWidget(self.theta_slider, 7, 0, 1, 2)
         animate_button_layout = QHBoxLayout()
         self.animate_fm_button = QPushButton("Animate FM")
@@ -533,7 +2219,7 @@ class ExchangeAnimator(QMainWindow):
         # Connect Signals
         self.two_spin_widget.update_signal = UpdateNotifier()
         self.setup_spin_widget_update_signal(self.two_spin_widget)
-        self.two_spin_widget.update_signal.updated.connect(self.update_energy_plot)
+        self.two_spin_widget.update_signal.updated.connect(self.energy_plot_updater.request)
         self.two_spin_widget.update_signal.updated.connect(self.update_tab1_labels)
         self.update_tab1_labels() # Initial update
 
@@ -557,7 +2243,7 @@ class ExchangeAnimator(QMainWindow):
         eq3_label = QLabel("ħω(k) = 2JS [ 1 - cos(ka) ] = 4JS sin²(ka/2)")
         eq3_label.setObjectName("eqLabel")
         eq3_label.setAlignment(Qt.AlignCenter)
-        desc_label3 = QLabel("<b>Params:</b><br>• <b>J, S:</b> Energy scale.<br>• <b>a:</b> Sets Brillouin Zone (-π/a ≤ k ≤ +π/a).<br>• <b>k:</b> Selects wave (low k=long λ, high k=short λ).<br><i>Plot shows E vs k. Animation shows selected wave.</i>")
+        desc_label3 = QLabel("<b>Params:</b><br>• <b>J, S:</b> Energy scale.<br>• <b>a:</b> Sets Brillouin Zone (-π/a ≤ k ≤ +π/a).<br>• <b>k:</b> Selects wave (low k=long λ, high k=short λ).<br>• <b>α:</b> Gilbert damping of the simulated chain.<br><i>Plot shows E vs k. Animation shows selected wave on an LLG-simulated chain.</i>")
         desc_label3.setWordWrap(True)
         desc_label3.setObjectName("descLabel")
         info_layout.addWidget(title_label)
@@ -567,22 +2253,25 @@ class ExchangeAnimator(QMainWindow):
         info_layout.addWidget(desc_label3)
         info_layout.addStretch()
         # Visualization Area
-        self.dispersion_plot_canvas = MplCanvas(self, width=5, height=3, dpi=100) # Real or placeholder
+        self.dispersion_plot_canvas = make_canvas(self, width=5, height=3, dpi=100) # Matplotlib or native
         vis_layout.addWidget(self.dispersion_plot_canvas)
         self.spin_chain_widget = SpinChainWidget()
+        self.spin_chain_widget.remote = self.view_only
+        self.measured_dispersion = None # (J, S, ka, omega) from the last "Measure ω(k)"
         vis_layout.addWidget(self.spin_chain_widget)
         # Controls Frame
         controls_frame = QFrame()
         controls_frame.setObjectName("controlsFrame")
         controls_group_layout = QGridLayout(controls_frame)
         controls_group_layout.setSpacing(12)
+        self.tab2_updater = CoalescedUpdate(self.update_tab2_visuals, self)
         self.j2_label = QLabel()
         controls_group_layout.addWidget(self.j2_label, 0, 0, 1, 2)
         self.j2_slider = QSlider(Qt.Horizontal)
         self.j2_slider.setMinimum(1)
         self.j2_slider.setMaximum(200)
         self.j2_slider.setValue(100)
-        self.j2_slider.valueChanged.connect(self.update_tab2_visuals)
+        self.tab2_updater.track(self.j2_slider)
         controls_group_layout.addWidget(self.j2_slider, 1, 0, 1, 2)
         self.s2_label = QLabel()
         controls_group_layout.addWidget(self.s2_label, 2, 0, 1, 2)
@@ -590,7 +2279,7 @@ class ExchangeAnimator(QMainWindow):
         self.s2_slider.setMinimum(5)
         self.s2_slider.setMaximum(50)
         self.s2_slider.setValue(10)
-        self.s2_slider.valueChanged.connect(self.update_tab2_visuals)
+        self.tab2_updater.track(self.s2_slider)
         controls_group_layout.addWidget(self.s2_slider, 3, 0, 1, 2)
         self.a2_label = QLabel()
         controls_group_layout.addWidget(self.a2_label, 4, 0, 1, 2)
@@ -598,7 +2287,7 @@ class ExchangeAnimator(QMainWindow):
         self.a2_slider.setMinimum(50)
         self.a2_slider.setMaximum(200)
         self.a2_slider.setValue(100)
-        self.a2_slider.valueChanged.connect(self.update_tab2_visuals)
+        self.tab2_updater.track(self.a2_slider)
         controls_group_layout.addWidget(self.a2_slider, 5, 0, 1, 2)
         self.k2_label = QLabel()
         controls_group_layout.addWidget(self.k2_label, 6, 0, 1, 2)
@@ -606,21 +2295,35 @@ class ExchangeAnimator(QMainWindow):
         self.k2_slider.setMinimum(0)
         self.k2_slider.setMaximum(100)
         self.k2_slider.setValue(25)
-        self.k2_slider.valueChanged.connect(self.update_tab2_visuals)
+        self.tab2_updater.track(self.k2_slider)
         controls_group_layout.addWidget(self.k2_slider, 7, 0, 1, 2)
+        self.damping2_label = QLabel()
+        controls_group_layout.addWidget(self.damping2_label, 8, 0, 1, 2)
+        self.damping2_slider = QSlider(Qt.Horizontal)
+        self.damping2_slider.setMinimum(0)
+        self.damping2_slider.setMaximum(100)
+        self.damping2_slider.setValue(0)
+        self.tab2_updater.track(self.damping2_slider)
+        controls_group_layout.addWidget(self.damping2_slider, 9, 0, 1, 2)
         self.omega_info_label = QLabel()
-        controls_group_layout.addWidget(self.omega_info_label, 8, 0, 1, 2)
+        controls_group_layout.addWidget(self.omega_info_label, 10, 0, 1, 2)
         self.animate_chain_button = QPushButton("Start Wave")
         self.animate_chain_button.setToolTip("Start/Stop Wave Animation")
         self.animate_chain_button.setCheckable(True)
         self.animate_chain_button.toggled.connect(self.toggle_spin_chain_animation)
-        controls_group_layout.addWidget(self.animate_chain_button, 9, 0, 1, 2)
-        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 10, 0)
+        self.animate_chain_button.setEnabled(not self.view_only) # A --view client shows the streamed wave instead
+        controls_group_layout.addWidget(self.animate_chain_button, 11, 0)
+        self.measure_dispersion_button = QPushButton("Measure ω(k)")
+        self.measure_dispersion_button.setToolTip("Measure the dispersion numerically with the LLG solver")
+        self.measure_dispersion_button.clicked.connect(self.measure_llg_dispersion)
+        controls_group_layout.addWidget(self.measure_dispersion_button, 11, 1)
+        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 12, 0)
         # Assemble Layouts
         controls_layout.addWidget(info_frame, 2)
         controls_layout.addWidget(controls_frame, 3)
         layout.addLayout(vis_layout, 7)
         layout.addLayout(controls_layout, 5)
+        self.spin_chain_widget.omega_measured.connect(lambda omega: self.tab2_updater.request())
         self.update_tab2_visuals() # Initial update
 
     def setup_tab3(self):
@@ -643,7 +2346,7 @@ class ExchangeAnimator(QMainWindow):
         desc_label2 = QLabel("<b>Domain Wall</b>: Transition between domains, balances A & K. For 180° Bloch wall (uniaxial K):")
         desc_label2.setWordWrap(True)
         desc_label2.setObjectName("descLabel")
-        eq_profile_label = QLabel("m<sub>z</sub>(x) = tanh(x/δ<sub>w</sub>),  m<sub>y</sub>(x) = sech(x/δ<sub>w</sub>)")
+        eq_profile_label = QLabel("m<sub>z</sub>(x) = tanh(πx/δ<sub>w</sub>),  m<sub>y</sub>(x) = sech(πx/δ<sub>w</sub>)")
         eq_profile_label.setObjectName("eqLabel")
         eq_profile_label.setAlignment(Qt.AlignCenter)
         desc_label3 = QLabel("Characteristic <b>wall width (δ<sub>w</sub>)</b>:")
@@ -652,7 +2355,7 @@ class ExchangeAnimator(QMainWindow):
         eq_width_label = QLabel("δ<sub>w</sub> = π √(A / K)")
         eq_width_label.setObjectName("eqLabel")
         eq_width_label.setAlignment(Qt.AlignCenter)
-        desc_label4 = QLabel("• Larger <b>A</b> → wider wall.<br>• Larger <b>K</b> → narrower wall.<br><i>Plot shows m<sub>y</sub>, m<sub>z</sub>. Animation shows spin rotation.</i>")
+        desc_label4 = QLabel("• Larger <b>A</b> → wider wall.<br>• Larger <b>K</b> → narrower wall.<br>• Transverse field <b>H<sub>y</sub></b> cants the domains and widens the wall.<br><i>Plot shows analytic and numerically relaxed m<sub>y</sub>, m<sub>z</sub>. Animation shows spin rotation.</i>")
         desc_label4.setWordWrap(True)
         desc_label4.setObjectName("descLabel")
         info_layout.addWidget(title_label)
@@ -665,7 +2368,7 @@ class ExchangeAnimator(QMainWindow):
         info_layout.addWidget(desc_label4)
         info_layout.addStretch()
         # Visualization Area
-        self.dw_profile_canvas = MplCanvas(self, width=5, height=3, dpi=100) # Real or placeholder
+        self.dw_profile_canvas = make_canvas(self, width=5, height=3, dpi=100) # Matplotlib or native
         vis_layout.addWidget(self.dw_profile_canvas)
         self.domain_wall_widget = DomainWallWidget()
         vis_layout.addWidget(self.domain_wall_widget)
@@ -674,13 +2377,14 @@ class ExchangeAnimator(QMainWindow):
         controls_frame.setObjectName("controlsFrame")
         controls_group_layout = QGridLayout(controls_frame)
         controls_group_layout.setSpacing(12)
+        self.tab3_updater = CoalescedUpdate(self.update_tab3_visuals, self)
         self.a3_label = QLabel()
         controls_group_layout.addWidget(self.a3_label, 0, 0, 1, 2)
         self.a3_slider = QSlider(Qt.Horizontal)
         self.a3_slider.setMinimum(1)
         self.a3_slider.setMaximum(300)
         self.a3_slider.setValue(100)
-        self.a3_slider.valueChanged.connect(self.update_tab3_visuals)
+        self.tab3_updater.track(self.a3_slider)
         controls_group_layout.addWidget(self.a3_slider, 1, 0, 1, 2)
         self.k3_label = QLabel()
         controls_group_layout.addWidget(self.k3_label, 2, 0, 1, 2)
@@ -688,12 +2392,29 @@ class ExchangeAnimator(QMainWindow):
         self.k3_slider.setMinimum(1)
         self.k3_slider.setMaximum(500)
         self.k3_slider.setValue(100)
-        self.k3_slider.valueChanged.connect(self.update_tab3_visuals)
+        self.tab3_updater.track(self.k3_slider)
         controls_group_layout.addWidget(self.k3_slider, 3, 0, 1, 2)
+        self.h3_label = QLabel()
+        controls_group_layout.addWidget(self.h3_label, 4, 0, 1, 2)
+        self.h3_slider = QSlider(Qt.Horizontal)
+        self.h3_slider.setMinimum(0)
+        self.h3_slider.setMaximum(300)
+        self.h3_slider.setValue(0)
+        self.tab3_updater.track(self.h3_slider)
+        controls_group_layout.addWidget(self.h3_slider, 5, 0, 1, 2)
+        self.demag3_checkbox = QCheckBox(f"Demagnetizing approximation (N_y = {DW_DEMAG_FACTOR})")
+        self.demag3_checkbox.toggled.connect(self.tab3_updater.request)
+        controls_group_layout.addWidget(self.demag3_checkbox, 6, 0, 1, 2)
         self.delta_w_info_label = QLabel()
         self.delta_w_info_label.setStyleSheet("font-weight: bold; color: darkred;")
-        controls_group_layout.addWidget(self.delta_w_info_label, 4, 0, 1, 2)
-        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 5, 0)
+        controls_group_layout.addWidget(self.delta_w_info_label, 7, 0, 1, 2)
+        self.dw_solver_label = QLabel()
+        self.dw_solver_label.setWordWrap(True)
+        controls_group_layout.addWidget(self.dw_solver_label, 8, 0, 1, 2)
+        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 9, 0)
+        self.dw_solver = DomainWallRelaxation()
+        self.dw_preview_solver = DomainWallRelaxation(DW_PREVIEW_CELLS) # Keeps drag previews within a frame
+        self.dw_solver_inputs = None
         # Assemble Layouts
         controls_layout.addWidget(info_frame, 2)
         controls_layout.addWidget(controls_frame, 1)
@@ -701,6 +2422,291 @@ class ExchangeAnimator(QMainWindow):
         layout.addLayout(controls_layout, 5)
         self.update_tab3_visuals() # Initial update
 
+    def setup_tab4(self):
+        """Sets up the layout and widgets for Tab 4 (Monte Carlo Lattice)."""
+        layout = QHBoxLayout(self.tab4)
+        controls_layout = QVBoxLayout()
+        vis_layout = QHBoxLayout()
+        # Info Frame
+        info_frame = QFrame()
+        info_frame.setObjectName("infoFrame")
+        info_layout = QVBoxLayout(info_frame)
+        title_label = QLabel("Temperature and Ordering (2D Lattice)")
+        title_label.setObjectName("titleLabel")
+        desc_label = QLabel("Thermal fluctuations compete with <b>exchange</b>. Monte Carlo samples spin configurations with Boltzmann weight e<sup>-E/k<sub>B</sub>T</sup>.")
+        desc_label.setWordWrap(True)
+        desc_label.setObjectName("descLabel")
+        eq_label = QLabel("E = - J Σ<sub>⟨ij⟩</sub> <b>S</b><sub>i</sub> ⋅ <b>S</b><sub>j</sub> - h Σ<sub>i</sub> S<sub>i</sub><sup>z</sup>")
+        eq_label.setObjectName("eqLabel")
+        eq_label.setAlignment(Qt.AlignCenter)
+        desc_label2 = QLabel(f"• <b>Ising</b> (S = ±1): orders below T<sub>c</sub> ≈ {ONSAGER_TC:.3f} J (Onsager).<br>• <b>Heisenberg</b> (3D unit vectors): no long-range order at T > 0 in 2D (Mermin-Wagner).<br>• <b>χ</b> = N(⟨m²⟩ - ⟨|m|⟩²)/T peaks near T<sub>c</sub>.<br><i>Image shows S<sup>z</sup> (red = up, blue = down) or the in-plane angle. Traces show M, E and χ per sweep.</i>")
+        desc_label2.setWordWrap(True)
+        desc_label2.setObjectName("descLabel")
+        info_layout.addWidget(title_label)
+        info_layout.addWidget(desc_label)
+        info_layout.addWidget(eq_label)
+        info_layout.addWidget(desc_label2)
+        info_layout.addStretch()
+        # Visualization Area
+        self.lattice_widget = LatticeWidget()
+        vis_layout.addWidget(self.lattice_widget, 3)
+        self.mc_trace_canvas = make_canvas(self, width=3, height=5, dpi=100) # Matplotlib or native
+        self.mc_trace_axes = None
+        if self.mc_trace_canvas.axes:
+            fig = self.mc_trace_canvas.figure
+            fig.delaxes(self.mc_trace_canvas.axes)
+            self.mc_trace_axes = fig.subplots(3, 1, sharex=True)
+        vis_layout.addWidget(self.mc_trace_canvas, 2)
+        # Controls Frame
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controlsFrame")
+        controls_group_layout = QGridLayout(controls_frame)
+        controls_group_layout.setSpacing(12)
+        self.tab4_updater = CoalescedUpdate(self.update_tab4_params, self)
+        self.mc_model_combo = QComboBox()
+        self.mc_model_combo.addItems(["Ising", "Heisenberg"])
+        self.mc_model_combo.currentIndexChanged.connect(self.reset_monte_carlo)
+        controls_group_layout.addWidget(self.mc_model_combo, 0, 0)
+        self.mc_size_combo = QComboBox()
+        self.mc_size_combo.addItems([f"{L} × {L}" for L in MC_LATTICE_SIZES])
+        self.mc_size_combo.setCurrentIndex(MC_LATTICE_SIZES.index(self.lattice_widget.simulation.size))
+        self.mc_size_combo.currentIndexChanged.connect(self.reset_monte_carlo)
+        controls_group_layout.addWidget(self.mc_size_combo, 0, 1)
+        self.mc_algorithm_combo = QComboBox()
+        self.mc_algorithm_combo.addItems(["Metropolis", "Heat bath (Ising)"])
+        self.mc_algorithm_combo.currentIndexChanged.connect(lambda index: self.tab4_updater.request())
+        controls_group_layout.addWidget(self.mc_algorithm_combo, 1, 0)
+        view_layout = QHBoxLayout()
+        self.mc_color_combo = QComboBox()
+        self.mc_color_combo.addItems(["Colour: S^z", "Colour: angle"])
+        self.mc_color_combo.currentIndexChanged.connect(self.update_lattice_view)
+        self.mc_arrows_checkbox = QCheckBox("Arrows")
+        self.mc_arrows_checkbox.toggled.connect(self.update_lattice_view)
+        view_layout.addWidget(self.mc_color_combo)
+        view_layout.addWidget(self.mc_arrows_checkbox)
+        controls_group_layout.addLayout(view_layout, 1, 1)
+        self.t4_label = QLabel()
+        controls_group_layout.addWidget(self.t4_label, 2, 0, 1, 2)
+        self.t4_slider = QSlider(Qt.Horizontal)
+        self.t4_slider.setMinimum(5)
+        self.t4_slider.setMaximum(500)
+        self.t4_slider.setValue(200)
+        self.tab4_updater.track(self.t4_slider)
+        controls_group_layout.addWidget(self.t4_slider, 3, 0, 1, 2)
+        self.j4_label = QLabel()
+        controls_group_layout.addWidget(self.j4_label, 4, 0, 1, 2)
+        self.j4_slider = QSlider(Qt.Horizontal)
+        self.j4_slider.setMinimum(-200)
+        self.j4_slider.setMaximum(200)
+        self.j4_slider.setValue(100)
+        self.tab4_updater.track(self.j4_slider)
+        controls_group_layout.addWidget(self.j4_slider, 5, 0, 1, 2)
+        self.h4_label = QLabel()
+        controls_group_layout.addWidget(self.h4_label, 6, 0, 1, 2)
+        self.h4_slider = QSlider(Qt.Horizontal)
+        self.h4_slider.setMinimum(-100)
+        self.h4_slider.setMaximum(100)
+        self.h4_slider.setValue(0)
+        self.tab4_updater.track(self.h4_slider)
+        controls_group_layout.addWidget(self.h4_slider, 7, 0, 1, 2)
+        self.sweeps4_label = QLabel()
+        controls_group_layout.addWidget(self.sweeps4_label, 8, 0, 1, 2)
+        self.sweeps4_slider = QSlider(Qt.Horizontal)
+        self.sweeps4_slider.setMinimum(1)
+        self.sweeps4_slider.setMaximum(20)
+        self.sweeps4_slider.setValue(1)
+        self.tab4_updater.track(self.sweeps4_slider)
+        controls_group_layout.addWidget(self.sweeps4_slider, 9, 0, 1, 2)
+        self.mc_info_label = QLabel()
+        controls_group_layout.addWidget(self.mc_info_label, 10, 0, 1, 2)
+        self.run_mc_button = QPushButton("Run")
+        self.run_mc_button.setToolTip("Start/Stop Monte Carlo Sweeps")
+        self.run_mc_button.setCheckable(True)
+        self.run_mc_button.toggled.connect(self.toggle_monte_carlo)
+        controls_group_layout.addWidget(self.run_mc_button, 11, 0)
+        reset_mc_button = QPushButton("Randomize")
+        reset_mc_button.setToolTip("Restart from a random (T = ∞) configuration")
+        reset_mc_button.clicked.connect(self.reset_monte_carlo)
+        controls_group_layout.addWidget(reset_mc_button, 11, 1)
+        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 12, 0)
+        # Assemble Layouts
+        controls_layout.addWidget(info_frame, 2)
+        controls_layout.addWidget(controls_frame, 3)
+        layout.addLayout(vis_layout, 7)
+        layout.addLayout(controls_layout, 5)
+        self._last_trace_draw = 0.0
+        self.lattice_widget.frame_drawn.updated.connect(self.update_mc_readout)
+        self.update_tab4_params() # Initial update
+
+    def setup_tab5(self):
+        """Sets up the layout and widgets for Tab 5 (Dynamic Structure Factor)."""
+        layout = QHBoxLayout(self.tab5)
+        controls_layout = QVBoxLayout()
+        vis_layout = QVBoxLayout()
+        # Info Frame
+        info_frame = QFrame()
+        info_frame.setObjectName("infoFrame")
+        info_layout = QVBoxLayout(info_frame)
+        title_label = QLabel("Dynamic Structure Factor S(k, ω)")
+        title_label.setObjectName("titleLabel")
+        desc_label = QLabel("The <b>dynamic structure factor</b> is what inelastic neutron scattering measures: the spectral weight of spin fluctuations at wavevector <b>k</b> and frequency <b>ω</b>.")
+        desc_label.setWordWrap(True)
+        desc_label.setObjectName("descLabel")
+        eq_label = QLabel("S(k, ω) ∝ | Σ<sub>j,t</sub> ψ<sub>j</sub>(t) e<sup>-i(kja + ωt)</sup> |², ψ = m<sub>x</sub> + i m<sub>y</sub>")
+        eq_label.setObjectName("eqLabel")
+        eq_label.setAlignment(Qt.AlignCenter)
+        desc_label2 = QLabel(f"A periodic chain of {SQW_CHAIN_LENGTH} spins, seeded with weak noise, is integrated with LLG and recorded. Each time window is transformed with a 2D FFT over (t, x) and averaged.<br>• <b>Window:</b> longer windows resolve ω more finely but update less often.<br><i>The magnon branch should follow the analytic ħω = 4JS sin²(ka/2) (dashed).</i>")
+        desc_label2.setWordWrap(True)
+        desc_label2.setObjectName("descLabel")
+        info_layout.addWidget(title_label)
+        info_layout.addWidget(desc_label)
+        info_layout.addWidget(eq_label)
+        info_layout.addWidget(desc_label2)
+        info_layout.addStretch()
+        # Visualization Area
+        self.sqw_canvas = make_canvas(self, width=5, height=4, dpi=100) # Matplotlib or native
+        vis_layout.addWidget(self.sqw_canvas)
+        self.structure_factor = StructureFactor(LLGChain(SQW_CHAIN_LENGTH))
+        # The chain is recorded and transformed on a worker thread that publishes the averaged spectrum
+        self.sqw_worker = SimulationWorker(self.structure_factor.step, self.structure_factor.write_snapshot,
+                                           self.structure_factor.snapshot_shape(), parent=self)
+        self._sqw_drawn_key = None
+        # Controls Frame
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controlsFrame")
+        controls_group_layout = QGridLayout(controls_frame)
+        controls_group_layout.setSpacing(12)
+        self.tab5_updater = CoalescedUpdate(self.update_tab5_params, self)
+        self.j5_label = QLabel()
+        controls_group_layout.addWidget(self.j5_label, 0, 0, 1, 2)
+        self.j5_slider = QSlider(Qt.Horizontal)
+        self.j5_slider.setMinimum(1)
+        self.j5_slider.setMaximum(200)
+        self.j5_slider.setValue(100)
+        self.tab5_updater.track(self.j5_slider)
+        controls_group_layout.addWidget(self.j5_slider, 1, 0, 1, 2)
+        self.s5_label = QLabel()
+        controls_group_layout.addWidget(self.s5_label, 2, 0, 1, 2)
+        self.s5_slider = QSlider(Qt.Horizontal)
+        self.s5_slider.setMinimum(5)
+        self.s5_slider.setMaximum(50)
+        self.s5_slider.setValue(10)
+        self.tab5_updater.track(self.s5_slider)
+        controls_group_layout.addWidget(self.s5_slider, 3, 0, 1, 2)
+        self.sqw_window_combo = QComboBox()
+        self.sqw_window_combo.addItems([f"Window: {size} samples" for size in SQW_WINDOW_SIZES])
+        self.sqw_window_combo.setCurrentIndex(SQW_WINDOW_SIZES.index(self.structure_factor.window))
+        self.sqw_window_combo.currentIndexChanged.connect(self.set_structure_factor_window)
+        controls_group_layout.addWidget(self.sqw_window_combo, 4, 0)
+        self.sqw_log_checkbox = QCheckBox("Log scale")
+        self.sqw_log_checkbox.setChecked(True)
+        self.sqw_log_checkbox.toggled.connect(lambda checked: self.update_structure_factor_plot(force=True))
+        controls_group_layout.addWidget(self.sqw_log_checkbox, 4, 1)
+        self.sqw_info_label = QLabel()
+        controls_group_layout.addWidget(self.sqw_info_label, 5, 0, 1, 2)
+        self.run_sqw_button = QPushButton("Record")
+        self.run_sqw_button.setToolTip("Start/Stop recording the chain")
+        self.run_sqw_button.setCheckable(True)
+        self.run_sqw_button.toggled.connect(self.toggle_structure_factor)
+        controls_group_layout.addWidget(self.run_sqw_button, 6, 0)
+        reseed_sqw_button = QPushButton("Re-seed")
+        reseed_sqw_button.setToolTip("Restart from fresh noise and discard the recording")
+        reseed_sqw_button.clicked.connect(lambda: self.sqw_worker.submit(self.structure_factor.reset))
+        controls_group_layout.addWidget(reseed_sqw_button, 6, 1)
+        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 7, 0)
+        # Assemble Layouts
+        controls_layout.addWidget(info_frame, 2)
+        controls_layout.addWidget(controls_frame, 3)
+        layout.addLayout(vis_layout, 7)
+        layout.addLayout(controls_layout, 5)
+        self.update_tab5_params() # Initial update
+
+    def setup_tab6(self):
+        """Sets up the layout and widgets for Tab 6 (Magnon Thermodynamics)."""
+        layout = QHBoxLayout(self.tab6)
+        controls_layout = QVBoxLayout()
+        vis_layout = QVBoxLayout()
+        # Info Frame
+        info_frame = QFrame()
+        info_frame.setObjectName("infoFrame")
+        info_layout = QVBoxLayout(info_frame)
+        title_label = QLabel("Magnon Thermodynamics")
+        title_label.setObjectName("titleLabel")
+        desc_label = QLabel("Thermally excited <b>magnons</b> each lower the magnetization by one unit of spin and carry energy ħω(<b>k</b>). Summing Bose factors over the Brillouin zone gives M(T) and the heat capacity.")
+        desc_label.setWordWrap(True)
+        desc_label.setObjectName("descLabel")
+        eq_label = QLabel("M(T)/M(0) = 1 - (1/NS) Σ<sub>k</sub> 1/(e<sup>ħω<sub>k</sub>/k<sub>B</sub>T</sup> - 1)")
+        eq_label.setObjectName("eqLabel")
+        eq_label.setAlignment(Qt.AlignCenter)
+        desc_label2 = QLabel(f"• <b>3D:</b> Bloch's law ΔM/M(0) = ζ(3/2)/S · (k<sub>B</sub>T/4πD)<sup>3/2</sup> a³ with stiffness D = JSa². The zone is summed on a {MAGNON_BZ_POINTS[2]}³ grid whose small-k core is integrated as a continuum, so the curves hold down to T → 0.<br>• <b>1D, 2D:</b> the sum grows with system size, so long-range order is destroyed at any T > 0 (Mermin-Wagner).<br>• <b>C</b> ∝ T<sup>d/2</sup> at low T and approaches k<sub>B</sub> per spin at high T.<br><i>Dashed: low-temperature laws. Curves are cached per (J, S, dimension); the T slider only moves the cursor.</i>")
+        desc_label2.setWordWrap(True)
+        desc_label2.setObjectName("descLabel")
+        info_layout.addWidget(title_label)
+        info_layout.addWidget(desc_label)
+        info_layout.addWidget(eq_label)
+        info_layout.addWidget(desc_label2)
+        info_layout.addStretch()
+        # Visualization Area
+        self.thermo_canvas = make_canvas(self, width=5, height=5, dpi=100) # Matplotlib or native
+        self.thermo_axes = None
+        if self.thermo_canvas.axes:
+            fig = self.thermo_canvas.figure
+            fig.delaxes(self.thermo_canvas.axes)
+            self.thermo_axes = fig.subplots(2, 1, sharex=True)
+        vis_layout.addWidget(self.thermo_canvas)
+        # Controls Frame
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controlsFrame")
+        controls_group_layout = QGridLayout(controls_frame)
+        controls_group_layout.setSpacing(12)
+        self.tab6_updater = CoalescedUpdate(self.update_tab6_visuals, self)
+        self.thermo_dim_combo = QComboBox()
+        self.thermo_dim_combo.addItems(["1D chain", "2D square lattice", "3D simple cubic"])
+        self.thermo_dim_combo.setCurrentIndex(2)
+        self.thermo_dim_combo.currentIndexChanged.connect(lambda index: self.tab6_updater.request())
+        controls_group_layout.addWidget(self.thermo_dim_combo, 0, 0, 1, 2)
+        self.j6_label = QLabel()
+        controls_group_layout.addWidget(self.j6_label, 1, 0, 1, 2)
+        self.j6_slider = QSlider(Qt.Horizontal)
+        self.j6_slider.setMinimum(10)
+        self.j6_slider.setMaximum(200)
+        self.j6_slider.setValue(100)
+        self.tab6_updater.track(self.j6_slider)
+        controls_group_layout.addWidget(self.j6_slider, 2, 0, 1, 2)
+        self.s6_label = QLabel()
+        controls_group_layout.addWidget(self.s6_label, 3, 0, 1, 2)
+        self.s6_slider = QSlider(Qt.Horizontal)
+        self.s6_slider.setMinimum(5)
+        self.s6_slider.setMaximum(50)
+        self.s6_slider.setValue(10)
+        self.tab6_updater.track(self.s6_slider)
+        controls_group_layout.addWidget(self.s6_slider, 4, 0, 1, 2)
+        self.a6_label = QLabel()
+        controls_group_layout.addWidget(self.a6_label, 5, 0, 1, 2)
+        self.a6_slider = QSlider(Qt.Horizontal)
+        self.a6_slider.setMinimum(50)
+        self.a6_slider.setMaximum(200)
+        self.a6_slider.setValue(100)
+        self.tab6_updater.track(self.a6_slider)
+        controls_group_layout.addWidget(self.a6_slider, 6, 0, 1, 2)
+        self.t6_label = QLabel()
+        controls_group_layout.addWidget(self.t6_label, 7, 0, 1, 2)
+        self.t6_slider = QSlider(Qt.Horizontal)
+        self.t6_slider.setMinimum(1)
+        self.t6_slider.setMaximum(int(MAGNON_T_MAX * 100))
+        self.t6_slider.setValue(50)
+        self.tab6_updater.track(self.t6_slider)
+        controls_group_layout.addWidget(self.t6_slider, 8, 0, 1, 2)
+        self.thermo_info_label = QLabel()
+        controls_group_layout.addWidget(self.thermo_info_label, 9, 0, 1, 2)
+        controls_group_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding), 10, 0)
+        # Assemble Layouts
+        controls_layout.addWidget(info_frame, 2)
+        controls_layout.addWidget(controls_frame, 3)
+        layout.addLayout(vis_layout, 7)
+        layout.addLayout(controls_layout, 5)
+        self.update_tab6_visuals() # Initial update
+
 
     # --- Callback and Update Methods ---
     # (Methods remain unchanged from previous version)
@@ -757,15 +2763,15 @@ class ExchangeAnimator(QMainWindow):
             self.theta_slider.setValue(int(theta_deg % 360))
             self.theta_slider.blockSignals(False)
             
-    def update_energy_plot(self):
-        if not MATPLOTLIB_AVAILABLE or not hasattr(self, 'energy_plot_canvas') or not self.energy_plot_canvas.axes:
-            return # Check placeholder case
+    def update_energy_plot(self, preview=False):
+        if not hasattr(self, 'energy_plot_canvas') or not self.energy_plot_canvas.axes:
+            return # Canvas not created yet
         ax = self.energy_plot_canvas.axes
         fig = self.energy_plot_canvas.figure
         theta_rad_current = self.two_spin_widget.s2_angle_rad
         J_current = self.two_spin_widget.J
         S_current = self.two_spin_widget.S
-        theta_range_deg = np.linspace(0, 360, 200)
+        theta_range_deg = np.linspace(0, 360, 60 if preview else 200) # Coarser curve while dragging
         theta_range_rad = np.radians(theta_range_deg)
         energy_range = -J_current * (S_current**2) * np.cos(theta_range_rad)
         if not np.all(np.isfinite(energy_range)) or abs(J_current) < 1e-9:
@@ -787,14 +2793,14 @@ class ExchangeAnimator(QMainWindow):
             min_e, max_e = np.nanmin(energy_range), np.nanmax(energy_range)
             padding = (max_e - min_e) * 0.15 + 1e-6
             ax.set_ylim(min_e - padding, max_e + padding)
-        fig.tight_layout(rect=[0, 0, 1, 0.95])
+        if not preview: fig.tight_layout(rect=[0, 0, 1, 0.95]) # Layout pass is skipped for previews
         self.energy_plot_canvas.draw()
         
     def start_two_spin_animation(self, target_rad):
         self.theta_slider.setEnabled(False)
         self.two_spin_widget.start_animation(target_rad)
         
-    def update_tab2_visuals(self):
+    def update_tab2_visuals(self, preview=False):
         if not hasattr(self, 'j2_slider'):
             return # Check if widgets initialized
         J = self.j2_slider.value() / 100.0
@@ -802,39 +2808,62 @@ class ExchangeAnimator(QMainWindow):
         a = self.a2_slider.value() / 100.0
         k_factor = self.k2_slider.value() / 100.0
         k_selected = k_factor * PI / a if a > 1e-6 else 0
+        damping = self.damping2_slider.value() / 500.0
         self.j2_label.setText(f"J = {J:.2f}")
         self.s2_label.setText(f"S = {S:.1f}")
         self.a2_label.setText(f"a = {a:.2f} (Lattice Spacing)")
         self.k2_label.setText(f"k = {k_factor:.2f} π/a")
+        self.damping2_label.setText(f"α = {damping:.3f} (Gilbert Damping)")
         omega_max = 4 * J * S
-        omega_selected = omega_max * (np.sin(k_selected * a / 2.0)**2) if a > 1e-6 else 0
-        self.omega_info_label.setText(f"ħω(k) = {omega_selected:.3f} (Max: {omega_max:.3f})")
-        if MATPLOTLIB_AVAILABLE and hasattr(self, 'dispersion_plot_canvas') and self.dispersion_plot_canvas.axes:
+        omega_selected = magnon_dispersion(J, S, a, k_selected) if a > 1e-6 else 0
+        omega_llg = float('nan')
+        if hasattr(self, 'spin_chain_widget'):
+            if not self.spin_chain_widget.remote: self.spin_chain_widget.set_chain_params(J, S, k_factor, damping)
+            omega_llg = self.spin_chain_widget.measured_omega()
+        omega_text = f"ħω(k) = {omega_selected:.3f} (Max: {omega_max:.3f})"
+        if np.isfinite(omega_llg): omega_text += f"<br>LLG measured: ω ≈ {omega_llg:.3f}"
+        self.omega_info_label.setText(omega_text)
+        if hasattr(self, 'dispersion_plot_canvas') and self.dispersion_plot_canvas.axes:
             ax = self.dispersion_plot_canvas.axes
             fig = self.dispersion_plot_canvas.figure
             ax.clear()
             k_max = PI / a if a > 1e-6 else PI
-            k_range = np.linspace(-k_max, k_max, 200)
-            omega_range = omega_max * (np.sin(k_range * a / 2.0)**2) if a > 1e-6 else np.zeros_like(k_range)
+            k_range = np.linspace(-k_max, k_max, 60 if preview else 200) # Coarser curve while dragging
+            omega_range = magnon_dispersion(J, S, a, k_range) if a > 1e-6 else np.zeros_like(k_range)
             norm_factor = (PI/a if a > 1e-6 else 1.0) # Avoid division by zero if a is zero
             ax.plot(k_range / norm_factor, omega_range, label="ħω(k)", color='darkblue')
             ax.plot([k_selected / norm_factor], [omega_selected], 'ro', markersize=8, label='Selected k')
+            if self.measured_dispersion is not None and self.measured_dispersion[:2] == (J, S):
+                ka_measured, omega_measured = self.measured_dispersion[2:]
+                ax.plot(np.concatenate([-ka_measured[::-1], ka_measured]) / PI, np.concatenate([omega_measured[::-1], omega_measured]),
+                        'g.', markersize=4, label='LLG (numerical)')
+            if np.isfinite(omega_llg):
+                ax.plot([k_factor], [omega_llg], 'gx', markersize=9, mew=2, label='LLG (live)')
             ax.set_xlabel("k / (π/a)")
             ax.set_ylabel("Energy ħω (arb. units)")
             ax.set_title("1D Magnon Dispersion Relation")
             ax.grid(True, linestyle='--', alpha=0.6)
             ax.set_ylim(-0.05 * max(omega_max, 1e-9), max(omega_max * 1.1, 0.1)) # Ensure non-zero range
             ax.set_xlim(-1.05, 1.05)
-            ax.xaxis.set_major_formatter(mticker.FormatStrFormatter('%g $\\pi/a$'))
-            ax.xaxis.set_major_locator(mticker.MultipleLocator(base=0.5))
+            k_ticks = np.arange(-1.0, 1.01, 0.5)
+            ax.set_xticks(k_ticks)
+            ax.set_xticklabels([f"{tick:g} π/a" for tick in k_ticks])
             ax.legend(fontsize='small')
-            fig.tight_layout()
+            if not preview: fig.tight_layout() # Layout pass is skipped for previews
             self.dispersion_plot_canvas.draw()
         if hasattr(self, 'spin_chain_widget'):
             visual_a = self.spin_chain_widget.a_pixels
             k_visual = k_factor * PI / visual_a if visual_a > 1e-6 else 0
             self.spin_chain_widget.set_params(k=k_visual, omega=omega_selected, a_pixels=visual_a)
             
+    def measure_llg_dispersion(self):
+        """Runs the LLG probe chain and overlays its measured ω(k) on the dispersion plot."""
+        if not hasattr(self, 'spin_chain_widget'): return
+        solver = self.spin_chain_widget.solver
+        ka, omega = solver.measure_dispersion()
+        self.measured_dispersion = (solver.J, solver.S, ka, omega)
+        self.update_tab2_visuals()
+
     def toggle_spin_chain_animation(self, checked):
          if hasattr(self, 'spin_chain_widget'):
             self.animate_chain_button.setText("Stop Wave" if checked else "Start Wave")
@@ -843,44 +2872,66 @@ class ExchangeAnimator(QMainWindow):
             else:
                 self.spin_chain_widget.stop_animation()
                 
-    def update_tab3_visuals(self):
+    def update_tab3_visuals(self, preview=False):
         # (Keep the initial part calculating A_val, K_val, delta_w, and updating labels)
         if not hasattr(self, 'a3_slider'): return # Check if widgets initialized
 
         # Get values from sliders
         A_val = self.a3_slider.value() / 10.0 * 1e-12; K_val = self.k3_slider.value() * 1e3
+        mu0_H = self.h3_slider.value() * 1e-3; demag = self.demag3_checkbox.isChecked()
         self.a3_label.setText(f"A = {A_val*1e12:.1f} pJ/m (Stiffness)")
         self.k3_label.setText(f"K = {K_val*1e-3:.0f} kJ/m³ (Anisotropy)")
+        self.h3_label.setText(f"μ₀H_y = {mu0_H*1e3:.0f} mT (Transverse Field)")
 
         # Calculate physical wall width delta_w = pi * sqrt(A / K)
-        delta_w = 0.0
-        if K_val > 1e-9: # Avoid division by zero / negative K issues
-            delta_w = PI * np.sqrt(A_val / K_val) if A_val >= 0 else -1.0
-        else:
-            delta_w = float('inf') # Infinite width if K=0
+        delta_w = float(domain_wall_width(A_val, K_val))
+        if np.isnan(delta_w): delta_w = -1.0 # Invalid (A<0)
 
         # Update label (convert meters to nm)
         if delta_w == float('inf'): self.delta_w_info_label.setText("<b>Wall Width δ<sub>w</sub> = ∞ (K≈0)</b>")
         elif delta_w < 0: self.delta_w_info_label.setText("<b>Wall Width δ<sub>w</sub> (Invalid A<0)</b>")
         else: self.delta_w_info_label.setText(f"<b>Wall Width δ<sub>w</sub> = {delta_w * 1e9:.2f} nm</b>")
 
+        # Numerical relaxation, warm-started from the previous profile; full resolution once the slider is released
+        solver = self.dw_preview_solver if preview else self.dw_solver; relaxed = 0 < delta_w < float('inf')
+        if relaxed and self.dw_solver_inputs != (A_val, K_val, mu0_H, demag, preview):
+            start = time.perf_counter()
+            solver.relax(A_val, K_val, mu0_H, demag, half_width=self.domain_wall_widget.x_range_factor * delta_w)
+            elapsed = time.perf_counter() - start
+            self.dw_solver_inputs = (A_val, K_val, mu0_H, demag, preview)
+            if solver.saturated: self.dw_solver_label.setText("Relaxed: saturated along y (μ₀H_y ≥ 2K/M<sub>s</sub>), no wall.")
+            else:
+                start_kind = "warm start" if solver.warm_started else "cold start"
+                status = "" if solver.converged else " <i>(not converged)</i>"
+                self.dw_solver_label.setText(f"Relaxed δ<sub>w</sub> = π/|θ′|<sub>max</sub> = {solver.wall_width()*1e9:.2f} nm<br>"
+                                             f"{solver.iterations} Newton steps ({start_kind}), {solver.num_cells:,} cells, {elapsed*1e3:.0f} ms{status}")
+        elif not relaxed: self.dw_solver_label.setText("")
+
         # Update Domain Wall Profile Plot
         # (Keep the Matplotlib plotting section as before)
-        if MATPLOTLIB_AVAILABLE and hasattr(self, 'dw_profile_canvas') and self.dw_profile_canvas.axes:
+        if hasattr(self, 'dw_profile_canvas') and self.dw_profile_canvas.axes:
             # ... (plotting code remains the same) ...
             ax = self.dw_profile_canvas.axes; fig = self.dw_profile_canvas.figure; ax.clear()
             if delta_w > 0 and delta_w != float('inf'):
-                x_range_val = self.domain_wall_widget.x_range_factor * delta_w; x_plot = np.linspace(-x_range_val, x_range_val, 300)
-                x_norm = x_plot / delta_w if delta_w > 1e-18 else x_plot * 1e18 # Avoid division by tiny delta_w
+                x_range_val = self.domain_wall_widget.x_range_factor * delta_w
+                if solver.theta is not None: x_range_val = max(x_range_val, solver.x[-1]) # Grid may be widened near saturation
+                x_plot = np.linspace(-x_range_val, x_range_val, 80 if preview else 300)
+                x_norm = PI * x_plot / delta_w if delta_w > 1e-18 else x_plot * 1e18 # Avoid division by tiny delta_w
                 mz_profile = np.tanh(x_norm); my_profile = 1.0 / np.cosh(x_norm)
-                ax.plot(x_plot * 1e9, mz_profile, label='m$_z$(x) = tanh(x/δ$_w$)', color='darkblue')
-                ax.plot(x_plot * 1e9, my_profile, label='m$_y$(x) = sech(x/δ$_w$)', color='darkred', linestyle='--')
+                ax.plot(x_plot * 1e9, mz_profile, label='m$_z$(x) = tanh(πx/δ$_w$)', color='darkblue')
+                ax.plot(x_plot * 1e9, my_profile, label='m$_y$(x) = sech(πx/δ$_w$)', color='darkred', linestyle='--')
+                if solver.theta is not None:
+                    x_num, my_num, mz_num = solver.profile(80 if preview else 300)
+                    ax.plot(x_num * 1e9, mz_num, label='m$_z$ (relaxed)', color='deepskyblue', linestyle=':', linewidth=2.5)
+                    ax.plot(x_num * 1e9, my_num, label='m$_y$ (relaxed)', color='orange', linestyle=':', linewidth=2.5)
                 label_dw = f'±δ$_w$ ({delta_w*1e9:.1f} nm)' if delta_w*1e9 < 1000 else f'±δ$_w$ ({delta_w*1e6:.1f} µm)'
                 ax.axvline(delta_w * 1e9, color='gray', linestyle=':', label=label_dw); ax.axvline(-delta_w * 1e9, color='gray', linestyle=':')
                 ax.set_xlabel("Position x (nm)")
             else:
                  ax.axhline(1, color='darkblue', linestyle='--', label='m$_z$ (Uniform)'); ax.axhline(0, color='darkred', linestyle='--', label='m$_y$ (Uniform)'); ax.set_xlabel("Position x")
-            ax.set_ylabel("Magnetization Component"); ax.set_title("Bloch Domain Wall Profile (180°)"); ax.grid(True, linestyle='--', alpha=0.6); ax.set_ylim(-1.1, 1.1); ax.legend(fontsize='small'); fig.tight_layout(); self.dw_profile_canvas.draw()
+            ax.set_ylabel("Magnetization Component"); ax.set_title("Bloch Domain Wall Profile (180°)"); ax.grid(True, linestyle='--', alpha=0.6); ax.set_ylim(-1.1, 1.1); ax.legend(fontsize='small')
+            if not preview: fig.tight_layout() # Layout pass is skipped for previews
+            self.dw_profile_canvas.draw()
 
 
         # --- Update Domain Wall Widget ---
@@ -906,6 +2957,177 @@ class ExchangeAnimator(QMainWindow):
             self.domain_wall_widget.set_delta_w(delta_w_pixels)
             # **********************************
 
+    def update_tab4_params(self, preview=False):
+        if not hasattr(self, 't4_slider'): return # Check if widgets initialized
+        T = self.t4_slider.value() / 100.0
+        J = self.j4_slider.value() / 100.0
+        h = self.h4_slider.value() / 100.0
+        self.t4_label.setText(f"T = {T:.2f} J/k<sub>B</sub> (Temperature)")
+        self.j4_label.setText(f"J = {J:.2f} (Exchange Constant)")
+        self.h4_label.setText(f"h = {h:.2f} (Field along z)")
+        self.sweeps4_label.setText(f"Sweeps per frame = {self.sweeps4_slider.value()}")
+        algorithm = 'heatbath' if self.mc_algorithm_combo.currentIndex() == 1 else 'metropolis'
+        self.lattice_widget.sweeps_per_frame = self.sweeps4_slider.value()
+        self.lattice_widget.set_params(J, h, T, algorithm)
+        self.update_mc_readout(force=True)
+
+    def reset_monte_carlo(self, *args):
+        if not hasattr(self, 'lattice_widget'): return
+        model = 'ising' if self.mc_model_combo.currentIndex() == 0 else 'heisenberg'
+        self.lattice_widget.set_lattice(MC_LATTICE_SIZES[self.mc_size_combo.currentIndex()], model)
+        self.update_mc_readout(force=True)
+
+    def update_lattice_view(self, *args):
+        mode = 'angle' if self.mc_color_combo.currentIndex() == 1 else 'mz'
+        self.lattice_widget.set_view(mode, self.mc_arrows_checkbox.isChecked())
+
+    def toggle_monte_carlo(self, checked):
+        if hasattr(self, 'lattice_widget'):
+            self.run_mc_button.setText("Stop" if checked else "Run")
+            if checked: self.lattice_widget.start_animation()
+            else: self.lattice_widget.stop_animation()
+
+    def update_mc_readout(self, force=False):
+        """Updates the M/E/χ label and, at most every MC_TRACE_REFRESH seconds, the trace plot."""
+        meta = self.lattice_widget.snapshot_meta # Of the frame on screen; never touch the simulation the worker owns
+        if meta is None: return # Nothing drawn yet since the buffer was resized
+        (sweeps, m, e, chi), initial = meta
+        dropped = self.lattice_widget.worker.buffer.dropped
+        if len(sweeps):
+            self.mc_info_label.setText(f"Sweep {sweeps[-1]}:  M = {m[-1]:+.3f},  E = {e[-1]:+.3f},  χ = {chi[-1]:.2f}"
+                                       f"<br><small>Dropped frames: {dropped}</small>")
+        else:
+            self.mc_info_label.setText(f"M = {initial[0]:+.3f},  E = {initial[1]:+.3f}")
+        now = time.monotonic()
+        if self.mc_trace_axes is None or (not force and now - self._last_trace_draw < MC_TRACE_REFRESH):
+            return
+        self._last_trace_draw = now
+        ax_m, ax_e, ax_chi = self.mc_trace_axes
+        for ax, values, label, color in ((ax_m, m, "M per spin", 'darkblue'), (ax_e, e, "E per spin", 'darkgreen'), (ax_chi, chi, "χ", 'darkred')):
+            ax.clear()
+            if len(sweeps): ax.plot(sweeps, values, color=color, linewidth=1.2)
+            ax.set_ylabel(label)
+            ax.grid(True, linestyle='--', alpha=0.6)
+        ax_m.set_ylim(-1.05, 1.05)
+        ax_m.set_title("MC Traces")
+        ax_chi.set_xlabel("Sweep")
+        if force: self.mc_trace_canvas.figure.tight_layout() # Layout pass only on parameter changes
+        self.mc_trace_canvas.draw()
+
+    def update_tab5_params(self, preview=False):
+        if not hasattr(self, 'j5_slider'): return # Check if widgets initialized
+        J = self.j5_slider.value() / 100.0
+        S = self.s5_slider.value() / 10
+        self.j5_label.setText(f"J = {J:.2f}")
+        self.s5_label.setText(f"S = {S:.1f}")
+        chain = self.structure_factor.chain
+        if (J, S) != (chain.J, chain.S): # Only a real change discards the recording
+            self.sqw_worker.submit(lambda: self.structure_factor.set_params(J, S))
+        self.update_structure_factor_plot(force=True)
+
+    def set_structure_factor_window(self, index):
+        sqw = self.structure_factor
+        def apply():
+            sqw.set_window(SQW_WINDOW_SIZES[index])
+            self.sqw_worker.resize(sqw.snapshot_shape())
+        self.sqw_worker.submit(apply)
+        self.update_structure_factor_plot(force=True)
+
+    def toggle_structure_factor(self, checked):
+        if hasattr(self, 'sqw_worker'):
+            self.run_sqw_button.setText("Stop" if checked else "Record")
+            if checked:
+                self.sqw_worker.start_simulation()
+                FrameScheduler.shared().start(self.sqw_canvas, lambda dt: self.update_structure_factor_plot())
+            else:
+                FrameScheduler.shared().stop(self.sqw_canvas)
+                self.sqw_worker.stop_simulation()
+                self.update_structure_factor_plot(force=True)
+
+    def update_structure_factor_plot(self, force=False):
+        """Redraws the S(k, ω) heat map when the worker has averaged a new window."""
+        power, meta, fresh = self.sqw_worker.latest()
+        if meta is None: return # Buffer was just resized; its first frame is not published yet
+        averaged, recorded, sample_dt, window, J, S = meta
+        key = (averaged, recorded < window, sample_dt, window, self.sqw_log_checkbox.isChecked())
+        if not force and key == self._sqw_drawn_key:
+            return
+        self._sqw_drawn_key = key
+        num_spins = power.shape[1]
+        omega_step = 2 * PI / (window * sample_dt)
+        omega_nyquist = omega_step * (window // 2)
+        status = f"Recorded {recorded} samples,  {averaged} windows averaged"
+        self.sqw_info_label.setText(f"{status}<br><small>Δω = {omega_step:.3f},  ω<sub>Nyquist</sub> = {omega_nyquist:.2f},  "
+                                    f"dropped frames: {self.sqw_worker.buffer.dropped}</small>")
+        ax = self.sqw_canvas.axes
+        ax.clear()
+        if averaged:
+            if self.sqw_log_checkbox.isChecked():
+                image = np.log10(np.maximum(power, power.max() * 10**-SQW_LOG_RANGE))
+                vmin, vmax = image.max() - SQW_LOG_RANGE, image.max()
+            else:
+                image, vmin, vmax = power, 0.0, power.max()
+            # Pixel centres sit on the FFT bins: k = 2πn/N (in units of π/a) and ω = m Δω
+            ax.imshow(image, origin='lower', aspect='auto', cmap='magma', interpolation='nearest', vmin=vmin, vmax=vmax,
+                      extent=(-1 - 1.0 / num_spins, 1 - 1.0 / num_spins, -omega_step / 2, omega_nyquist - omega_step / 2))
+        ka = np.linspace(-PI, PI, 200)
+        ax.plot(ka / PI, 4 * J * S * np.sin(ka / 2)**2, color='cyan', linestyle='--', linewidth=1.2, label="4JS sin²(ka/2)")
+        ax.set_xlim(-1, 1)
+        ax.set_ylim(0, omega_nyquist - omega_step / 2)
+        ax.set_xlabel("k / (π/a)")
+        ax.set_ylabel("Frequency ω (arb. units)")
+        ax.set_title("S(k, ω)" if averaged else "S(k, ω): press Record")
+        ax.legend(fontsize='small', loc='upper center')
+        if force: self.sqw_canvas.figure.tight_layout() # Layout pass only on parameter changes
+        self.sqw_canvas.draw()
+
+    def update_tab6_visuals(self, preview=False):
+        if not hasattr(self, 't6_slider'): return # Check if widgets initialized
+        dim = self.thermo_dim_combo.currentIndex() + 1
+        J = self.j6_slider.value() / 100.0
+        S = self.s6_slider.value() / 10
+        a = self.a6_slider.value() / 100.0
+        T_cursor = self.t6_slider.value() / 100.0
+        self.j6_label.setText(f"J = {J:.2f}")
+        self.s6_label.setText(f"S = {S:.1f}")
+        self.a6_label.setText(f"a = {a:.2f} (Lattice Spacing; D = JSa² = {J * S * a * a:.3f})")
+        self.t6_label.setText(f"T = {T_cursor:.2f} J/k<sub>B</sub> (Temperature Cursor)")
+        # Cached per (J, S, dimension); a only enters the stiffness D, and the cursor reads off the cached curves
+        T, magnetization, heat_capacity = magnon_thermodynamics(J, S, dim)
+        bloch, heat_capacity_low = magnon_low_temperature_laws(J, S, dim, T)
+        m_cursor = np.interp(T_cursor, T, magnetization)
+        c_cursor = np.interp(T_cursor, T, heat_capacity)
+        cache = magnon_thermodynamics.cache_info()
+        m_text = f"M/M(0) = {m_cursor:.4f}" if m_cursor > 0 else "M = 0 (no order)"
+        self.thermo_info_label.setText(f"At T = {T_cursor:.2f}:  {m_text},  C = {c_cursor:.4f} k<sub>B</sub> per spin"
+                                       f"<br><small>Magnons per spin: {S * (1.0 - m_cursor):.4g},  "
+                                       f"curve cache: {cache.hits} hits / {cache.misses} misses</small>")
+        if self.thermo_axes is None:
+            return
+        ax_m, ax_c = self.thermo_axes
+        for ax in (ax_m, ax_c):
+            ax.clear()
+            ax.set_xlim(0.0, MAGNON_T_MAX)
+            ax.grid(True, linestyle='--', alpha=0.6)
+            ax.axvline(T_cursor, color='gray', linestyle=':')
+        ax_m.plot(T, np.clip(magnetization, 0.0, None), color='darkblue', label="Zone sum")
+        if dim == 3:
+            ax_m.plot(T, 1.0 - bloch, color='darkorange', linestyle='--', label="Bloch T$^{3/2}$")
+        ax_m.plot([T_cursor], [max(m_cursor, 0.0)], 'ro', markersize=6)
+        ax_m.set_ylim(0.0, 1.05)
+        ax_m.set_ylabel("M(T) / M(0)")
+        ax_m.set_title(f"Spin-Wave Thermodynamics ({self.thermo_dim_combo.currentText()})")
+        ax_m.legend(fontsize='small')
+        ax_c.plot(T, heat_capacity, color='darkred', label="Zone sum")
+        ax_c.plot(T, heat_capacity_low, color='darkorange', linestyle='--', label=f"∝ T$^{{{dim / 2:g}}}$")
+        ax_c.plot([T_cursor], [c_cursor], 'ro', markersize=6)
+        ax_c.set_ylim(0.0, 1.1)
+        ax_c.set_xlabel("T (J/k_B)")
+        ax_c.set_ylabel("C per spin (k_B)")
+        ax_c.legend(fontsize='small')
+        if not preview: self.thermo_canvas.figure.tight_layout() # Layout pass is skipped for previews
+        self.thermo_canvas.draw()
+
     # --- Common Methods ---
     def setup_spin_widget_update_signal(self, widget):
         """Patches the widget's update() method to also emit a signal."""
@@ -915,47 +3137,826 @@ class ExchangeAnimator(QMainWindow):
                 widget._original_update(*args, **kwargs)
                 if hasattr(widget, 'update_signal') and widget.update_signal: widget.update_signal.updated.emit()
             widget.update = new_update
+    def broadcast_controls(self):
+        """Sliders, combo boxes and check boxes by attribute name: the parameters --serve streams."""
+        return {name: widget for name, widget in sorted(vars(self).items()) if isinstance(widget, (QSlider, QComboBox, QCheckBox))}
+
+    def capture_broadcast_state(self):
+        """(params, angles, info, clock) of the current view, for BroadcastServer.publish()."""
+        params = {'tab': self.tabs.currentIndex()}
+        for name, widget in self.broadcast_controls().items():
+            if isinstance(widget, QSlider): params[name] = widget.value()
+            elif isinstance(widget, QComboBox): params[name] = widget.currentIndex()
+            else: params[name] = int(widget.isChecked())
+        two_spin_angle, J, S = self.two_spin_widget.export_state() if hasattr(self, 'two_spin_widget') else (0.0, 1.0, 1.0)
+        if hasattr(self, 'spin_chain_widget'):
+            chain_m, (chain_time, omega), a_pixels = self.spin_chain_widget.export_state()
+        else:
+            chain_m, chain_time, omega, a_pixels = np.array([[0.0], [0.0], [1.0]]).repeat(CHAIN_STRIP_SPINS, 1), 0.0, float('nan'), GRID_SPACING
+        info = {'two_spin': [J, S], 'chain': [chain_time, omega, a_pixels]}
+        return params, pack_spin_angles(two_spin_angle, chain_m), info, time.perf_counter() - START_TIME
+
+    def apply_broadcast_state(self, state):
+        """Shows a state received by BroadcastViewer: controls, tab and spin configurations."""
+        params, angles, info, clock = state
+        self.tabs.setCurrentIndex(params.get('tab', 0))
+        controls = self.broadcast_controls()
+        changed = False
+        for name, value in params.items(): # Controls of tabs this client has not built are skipped
+            widget = controls.get(name)
+            if widget is None: continue
+            widget.blockSignals(True) # Only mirror the value; the local solvers and workers stay idle
+            if isinstance(widget, QSlider): changed |= widget.value() != value; widget.setValue(value)
+            elif isinstance(widget, QComboBox): changed |= widget.currentIndex() != value; widget.setCurrentIndex(value)
+            else: changed |= widget.isChecked() != bool(value); widget.setChecked(bool(value))
+            widget.blockSignals(False)
+        two_spin_angle, chain_m = unpack_spin_angles(angles)
+        if hasattr(self, 'two_spin_widget'):
+            self.two_spin_widget.apply_export_state((two_spin_angle, *info['two_spin']))
+            self.two_spin_widget.update() # Also refreshes the tab 1 labels and energy plot
+        if hasattr(self, 'spin_chain_widget'):
+            chain_time, omega, a_pixels = info['chain']
+            self.spin_chain_widget.apply_export_state((chain_m, (chain_time, omega), a_pixels))
+            self.spin_chain_widget.update()
+            if changed: self.tab2_updater.request() # Labels and dispersion plot; a remote chain is not re-seeded
+
+    def changeEvent(self, event):
+        """Pauses or resumes the shared animation clock when the window is minimized or restored."""
+        if event.type() == QEvent.WindowStateChange:
+            FrameScheduler.shared().refresh()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        FrameScheduler.shared().refresh()
+
     def closeEvent(self, event):
         """Ensures timers are stopped when the window is closed."""
-        print("Closing application and stopping timers...")
+        log("Closing application and stopping timers...")
         if hasattr(self, 'two_spin_widget'): self.two_spin_widget.stop_animation()
         if hasattr(self, 'spin_chain_widget'): self.spin_chain_widget.stop_animation()
+        if hasattr(self, 'lattice_widget'): self.lattice_widget.stop_animation()
+        if hasattr(self, 'run_sqw_button'): self.run_sqw_button.setChecked(False)
         event.accept()
 
+# =============================================================================
+# Batch Parameter Sweeps (non-GUI, --sweep)
+# =============================================================================
+SWEEP_KINDS = {
+    # kind: (axis names, result name, formula); k is in units of π/a as on tab 2
+    'dispersion': (('J', 'S', 'a', 'k'), 'omega', lambda J, S, a, k: magnon_dispersion(J, S, a, k * PI / a)),
+    'wall': (('A', 'K'), 'delta_w', domain_wall_width),
+}
+SWEEP_DEFAULT_AXES = {
+    'J': '0.01:2:200', 'S': '0.5:5:10', 'a': '0.5:2:16', 'k': '0:1:101',
+    'A': '1e-13:3e-11:300', 'K': '1e3:5e5:500',
+}
+
+def parse_grid_spec(text):
+    """Parses 'start:stop:num' (inclusive linspace) or a comma-separated list of values."""
+    if ':' in text:
+        start, stop, num = text.split(':')
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(value) for value in text.split(',')])
+
+def evaluate_sweep_chunk(kind, axes, start, stop):
+    """Evaluates grid points [start, stop) of the C-ordered grid; returns the parameter columns and the result."""
+    formula = SWEEP_KINDS[kind][2]
+    indices = np.unravel_index(np.arange(start, stop), tuple(axis.size for axis in axes))
+    columns = [axis[index] for axis, index in zip(axes, indices)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return columns + [formula(*columns)]
+
+class NpzChunkWriter:
+    """Streams chunks into one .npz; read back chunk i as data['<column>_%05d' % i]."""
+    def __init__(self, path, names, axes):
+        self.names = names
+        self.chunks = 0
+        self.archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True)
+        for name, axis in zip(names, axes):
+            self._write_array(f"axis_{name}", axis)
+        self._write_array("shape", np.array([axis.size for axis in axes]))
+
+    def _write_array(self, key, array):
+        with self.archive.open(key + '.npy', 'w', force_zip64=True) as handle:
+            np.lib.format.write_array(handle, np.asarray(array), allow_pickle=False)
+
+    def write(self, columns):
+        for name, column in zip(self.names, columns):
+            self._write_array(f"{name}_{self.chunks:05d}", column)
+        self.chunks += 1
+
+    def close(self):
+        self._write_array("chunks", np.array(self.chunks))
+        self.archive.close()
+
+class CsvChunkWriter:
+    """Appends chunks as rows of a CSV file with a header line."""
+    def __init__(self, path, names, axes):
+        self.handle = open(path, 'w', newline='')
+        self.handle.write(','.join(names) + '\n')
+
+    def write(self, columns):
+        np.savetxt(self.handle, np.column_stack(columns), delimiter=',', fmt='%.10g')
+
+    def close(self):
+        self.handle.close()
+
+def run_sweep(kind, axes, output, chunk_size=SWEEP_CHUNK_SIZE, workers=None):
+    """Evaluates a sweep chunk by chunk and streams it to output (.npz or .csv); returns the points written."""
+    axis_names, result_name = SWEEP_KINDS[kind][:2]
+    total = int(np.prod([axis.size for axis in axes]))
+    writer_class = CsvChunkWriter if output.lower().endswith('.csv') else NpzChunkWriter
+    writer = writer_class(output, list(axis_names) + [result_name], axes)
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+    start_time = time.perf_counter()
+    try:
+        if total <= SWEEP_PARALLEL_THRESHOLD or workers == 1:
+            for start, stop in bounds:
+                writer.write(evaluate_sweep_chunk(kind, axes, start, stop))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                in_flight = 2 * workers
+                for start, stop in bounds:
+                    pending.append(pool.submit(evaluate_sweep_chunk, kind, axes, start, stop))
+                    if len(pending) >= in_flight:
+                        writer.write(pending.popleft().result())
+                while pending:
+                    writer.write(pending.popleft().result())
+    finally:
+        writer.close()
+    print(f"Sweep '{kind}': {total:,} points in {len(bounds)} chunk(s) written to {output} "
+          f"({time.perf_counter() - start_time:.2f} s)")
+    return total
+
+# =============================================================================
+# Offscreen Frame Export (non-GUI, --export)
+# =============================================================================
+EXPORT_WIDGETS = {'chain': SpinChainWidget, 'two-spin': TwoSpinWidget}
+_export_app = None    # Per-process offscreen QApplication of a render worker
+_export_widget = None # Per-process widget used by render_export_frames
+
+def simulate_export_states(kind, num_frames, fps, k_factor=0.25):
+    """Steps an animation deterministically at fps; returns one draw state per frame."""
+    widget = EXPORT_WIDGETS[kind]()
+    frame_dt = 1.0 / fps
+    states = []
+    if kind == 'chain':
+        widget.set_chain_params(1.0, 1.0, k_factor, 0.0)
+        for _ in range(num_frames):
+            states.append(widget.export_state())
+            widget.physics_step(frame_dt)
+            widget.worker.publish()
+            widget.poll_snapshot()
+    else:
+        target = PI
+        widget.start_animation(target)
+        for _ in range(num_frames):
+            states.append(widget.export_state())
+            widget.animate_step(frame_dt)
+            if not widget.animating:
+                target = PI - target
+                widget.start_animation(target)
+        widget.stop_animation()
+    return states
+
+def render_export_frames(kind, size, first_frame, states, directory, paletted=False):
+    """Renders consecutive frames to PNG files (quantized when paletted); runs in a process-pool worker."""
+    global _export_app, _export_widget
+    if QApplication.instance() is None:
+        _export_app = QApplication([sys.argv[0], '-platform', 'offscreen'])
+    if not isinstance(_export_widget, EXPORT_WIDGETS[kind]):
+        _export_widget = EXPORT_WIDGETS[kind]()
+    _export_widget.resize(*size)
+    image = QImage(size[0], size[1], QImage.Format_RGB32)
+    for index, state in enumerate(states, first_frame):
+        _export_widget.apply_export_state(state)
+        image.fill(Qt.white)
+        _export_widget.render(image)
+        path = os.path.join(directory, f"frame_{index:05d}.png")
+        if paletted:
+            from PIL import Image
+            rgb = image.convertToFormat(QImage.Format_RGB888)
+            frame = Image.frombuffer("RGB", size, rgb.constBits().asstring(rgb.sizeInBytes()), "raw", "RGB", rgb.bytesPerLine())
+            frame.quantize(colors=EXPORT_GIF_COLORS, method=Image.Quantize.FASTOCTREE).save(path, compress_level=1)
+        else:
+            image.save(path, "PNG", EXPORT_PNG_QUALITY)
+    return len(states)
+
+def read_export_frame(path):
+    """Loads a rendered frame into memory and closes its file."""
+    from PIL import Image
+    with Image.open(path) as frame:
+        return frame.copy()
+
+def run_export(kind, output, duration, fps, size, k_factor=0.25, workers=None):
+    """Exports an animation as a PNG sequence (output is a directory) or a GIF, rendering on a process pool."""
+    if output.lower().endswith('.gif') and not PIL_AVAILABLE:
+        raise RuntimeError("GIF export requires Pillow; export a PNG sequence instead.")
+    start_time = time.perf_counter()
+    num_frames = max(1, int(round(duration * fps)))
+    states = simulate_export_states(kind, num_frames, fps, k_factor)
+    make_gif = output.lower().endswith('.gif')
+    scratch = tempfile.TemporaryDirectory(prefix="export_") if make_gif else None # GIF frames are intermediate
+    directory = scratch.name if scratch else output
+    try:
+        os.makedirs(directory, exist_ok=True)
+        ranges = range(0, num_frames, EXPORT_FRAMES_PER_TASK)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for first in ranges:
+                render_export_frames(kind, size, first, states[first:first + EXPORT_FRAMES_PER_TASK], directory, make_gif)
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(render_export_frames, kind, size, first,
+                                       states[first:first + EXPORT_FRAMES_PER_TASK], directory, make_gif) for first in ranges]
+                for future in futures:
+                    future.result()
+        if make_gif:
+            from PIL import Image
+            frame_paths = [os.path.join(directory, f"frame_{index:05d}.png") for index in range(num_frames)]
+            with Image.open(frame_paths[0]) as first_frame: # Later frames are read one at a time, never all open
+                first_frame.save(output, save_all=True, append_images=(read_export_frame(path) for path in frame_paths[1:]),
+                                 duration=int(round(1000 / fps)), loop=0)
+    finally:
+        if scratch: scratch.cleanup()
+    elapsed = time.perf_counter() - start_time
+    print(f"Exported {num_frames} frames ({duration:g} s at {fps:g} fps) of '{kind}' to {output} "
+          f"in {elapsed:.2f} s ({duration / elapsed:.1f}x real time)")
+    return num_frames
+
+# =============================================================================
+# Paint Benchmark (non-interactive, --benchmark)
+# =============================================================================
+def frame_time_summary(seconds):
+    """Count, mean and percentiles (ms) of a list of frame times in seconds."""
+    values = np.asarray(seconds, dtype=float) * 1e3
+    if not values.size:
+        return {'count': 0}
+    p50, p90, p95, p99 = np.percentile(values, (50, 90, 95, 99))
+    return {'count': int(values.size), 'mean_ms': float(values.mean()), 'p50_ms': float(p50), 'p90_ms': float(p90),
+            'p95_ms': float(p95), 'p99_ms': float(p99), 'max_ms': float(values.max())}
+
+def run_benchmark(output, app):
+    """Times scripted slider sweeps and animation frames of every tab; writes the statistics as JSON."""
+    window = ExchangeAnimator()
+    window.resize(1150, 900)
+    window.show()
+    app.processEvents()
+    profiler = FrameProfiler.shared()
+    profiler.set_window(None) # Every sample of a scenario counts
+    profiler.enabled = True
+    scenarios = {}
+
+    def timed(name, frames):
+        """Runs (prepare, frame) pairs; prepare is untimed, frame is timed together with the repaint."""
+        page = window.tabs.currentWidget()
+        profiler.reset()
+        times = []
+        for prepare, frame in frames:
+            if prepare: prepare()
+            start = time.perf_counter()
+            if frame: frame()
+            page.repaint()
+            times.append(time.perf_counter() - start)
+        scenarios[name] = {'frame': frame_time_summary(times),
+                           'paint': frame_time_summary(profiler.samples['paint']),
+                           'update': frame_time_summary(profiler.samples['update'])}
+        app.processEvents()
+
+    def slider_frames(updater):
+        for slider in updater.sliders():
+            for value in np.linspace(slider.minimum(), slider.maximum(), BENCHMARK_SLIDER_STEPS).round().astype(int):
+                yield (lambda slider=slider, value=value: slider.setValue(int(value))), updater.flush
+            slider.setValue((slider.minimum() + slider.maximum()) // 2)
+            updater.flush()
+
+    for index, updater_name in enumerate(('energy_plot_updater', 'tab2_updater', 'tab3_updater', 'tab4_updater', 'tab5_updater',
+                                                 'tab6_updater')):
+        window.tabs.setCurrentIndex(index)
+        app.processEvents()
+        timed(f"{window.tabs.tabText(index)}: slider sweep", slider_frames(getattr(window, updater_name)))
+
+    window.tabs.setCurrentIndex(1)
+    chain = window.spin_chain_widget
+    def chain_step():
+        chain.physics_step(1.0 / TARGET_FPS)
+        chain.worker.publish()
+    for num_spins in (20, 80, 320):
+        chain.set_num_spins(num_spins)
+        timed(f"spin chain: {num_spins} arrows", ((chain_step, chain.poll_snapshot) for _ in range(BENCHMARK_FRAMES)))
+    chain.set_num_spins(20)
+
+    window.tabs.setCurrentIndex(3)
+    lattice = window.lattice_widget
+    for size_index, size in enumerate(MC_LATTICE_SIZES):
+        window.mc_size_combo.setCurrentIndex(size_index)
+        app.processEvents()
+        step = lambda: lattice.worker.submit(lambda: lattice.simulation.sweep(1))
+        timed(f"Monte Carlo: {size}x{size} lattice", ((step, None) for _ in range(BENCHMARK_FRAMES)))
+
+    window.tabs.setCurrentIndex(4)
+    sqw = window.structure_factor
+    def next_window():
+        target = sqw.averaged + 1
+        while sqw.averaged < target: sqw.step(PHYSICS_DT)
+        window.sqw_worker.publish()
+    timed("S(k, ω): half window + FFT + heat map", ((None, lambda: (next_window(), window.update_structure_factor_plot()))
+                                            for _ in range(BENCHMARK_FRAMES // 4)))
+
+    window.close()
+    result = {'plot_backend': PLOT_BACKEND, 'python': platform.python_version(), 'numpy': np.__version__,
+              'qt': QT_VERSION_STR, 'platform': platform.platform(), 'qpa': app.platformName(),
+              'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'scenarios': scenarios}
+    with open(output, 'w') as handle:
+        json.dump(result, handle, indent=2)
+    for name, stats in scenarios.items():
+        frame = stats['frame']
+        print(f"{name:45s} p50 {frame['p50_ms']:7.2f} ms   p95 {frame['p95_ms']:7.2f} ms   max {frame['max_ms']:7.2f} ms")
+    print(f"Benchmark results written to {output}")
+    return result
+
+# =============================================================================
+# Classroom Broadcast (--serve / --view / --load-test)
+# =============================================================================
+BROADCAST_HEADER = struct.Struct('!cIdI') # Kind (b'K' keyframe, b'D' delta), sequence number, clock (s), JSON length
+BROADCAST_LENGTH = struct.Struct('!I')    # Length prefix of every message
+
+def pack_spin_angles(two_spin_angle, chain_m):
+    """Quantizes the two-spin angle and the chain's polar/azimuthal angles to int16 (π ↔ 32767)."""
+    theta = np.arccos(np.clip(chain_m[2], -1.0, 1.0))
+    phi = np.arctan2(chain_m[1], chain_m[0])
+    wrapped = np.mod(two_spin_angle + PI, 2 * PI) - PI
+    return np.round(np.concatenate(([wrapped], theta, phi)) * (32767 / PI)).astype(np.int16)
+
+def unpack_spin_angles(angles):
+    """Inverse of pack_spin_angles: (two_spin_angle, chain_m of shape (3, N))."""
+    values = angles.astype(np.float64) * (PI / 32767)
+    theta, phi = np.split(values[1:], 2)
+    sin_theta = np.sin(theta)
+    return values[0], np.stack((sin_theta * np.cos(phi), sin_theta * np.sin(phi), np.cos(theta)))
+
+def pack_broadcast_message(kind, seq, clock, header, angles):
+    meta = json.dumps(header, separators=(',', ':')).encode()
+    body = BROADCAST_HEADER.pack(kind, seq, clock, len(meta)) + meta + zlib.compress(angles.tobytes(), 1)
+    return BROADCAST_LENGTH.pack(len(body)) + body
+
+async def read_broadcast_message(reader):
+    """Reads one length-prefixed message body from an asyncio StreamReader."""
+    length, = BROADCAST_LENGTH.unpack(await reader.readexactly(BROADCAST_LENGTH.size))
+    return await reader.readexactly(length)
+
+class BroadcastFrame:
+    """One published state: its delta against the previous frame, and a keyframe built on demand."""
+    def __init__(self, seq, clock, params, angles, info, delta=None, encode_time=0.0):
+        self.seq, self.clock = seq, clock
+        self.params, self.angles, self.info = params, angles, info
+        self.delta = delta # None for forced keyframes
+        self.encode_time = encode_time # Thread CPU seconds spent encoding this frame
+        self._keyframe = None
+
+    def keyframe(self):
+        if self._keyframe is None:
+            start = time.thread_time()
+            self._keyframe = pack_broadcast_message(b'K', self.seq, self.clock, {'params': self.params, 'info': self.info}, self.angles)
+            self.encode_time += time.thread_time() - start
+        return self._keyframe
+
+class BroadcastEncoder:
+    """Turns captured states into BroadcastFrames (zlib-compressed int16 angle deltas, periodic keyframes)."""
+    def __init__(self, keyframe_interval=BROADCAST_KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.params = {}
+        self.angles = None
+
+    def encode(self, state):
+        start = time.thread_time()
+        params, angles, info, clock = state
+        self.seq += 1
+        delta = None
+        if self.angles is not None and angles.shape == self.angles.shape and self.seq % self.keyframe_interval:
+            changed = {name: value for name, value in params.items() if self.params.get(name) != value}
+            delta = pack_broadcast_message(b'D', self.seq, clock, {'params': changed, 'info': info}, angles - self.angles)
+        self.params, self.angles = params, angles
+        return BroadcastFrame(self.seq, clock, params, angles, info, delta, time.thread_time() - start)
+
+class BroadcastDecoder:
+    """Rebuilds full states from keyframes and the deltas that follow them."""
+    def __init__(self):
+        self.seq = None
+        self.params = {}
+        self.angles = None
+
+    def decode(self, body):
+        """Returns (params, angles, info, clock), or None for a delta that does not follow the last frame."""
+        kind, seq, clock, meta_length = BROADCAST_HEADER.unpack_from(body)
+        offset = BROADCAST_HEADER.size
+        header = json.loads(body[offset:offset + meta_length])
+        values = np.frombuffer(zlib.decompress(body[offset + meta_length:]), dtype=np.int16)
+        if kind == b'K':
+            self.params = dict(header['params'])
+            self.angles = values.copy()
+        elif seq == (self.seq or 0) + 1 and self.angles is not None and values.size == self.angles.size:
+            self.params.update(header['params'])
+            self.angles += values
+        else:
+            return None # Wait for the next keyframe
+        self.seq = seq
+        return dict(self.params), self.angles.copy(), header['info'], clock
+
+class BroadcastClient:
+    """Write side of one connected viewer and the last frame it was sent."""
+    __slots__ = ('transport', 'sent')
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.sent = None
+
+class BroadcastServer:
+    """Streams state frames to any number of viewers over TCP (--serve) from an asyncio thread."""
+    def __init__(self, host='127.0.0.1', port=BROADCAST_PORT):
+        self.host, self.port = host, port
+        self.encoder = BroadcastEncoder()
+        self.latest = None
+        self.clients = set()
+        self.frames = 0
+        self.bytes_sent = 0
+        self.keyframes_sent = 0
+        self.dropped = 0     # Frames viewers skipped because they were slow
+        self.encode_time = 0.0 # Server-thread CPU seconds spent encoding (once per frame, shared by all viewers)
+        self._server = None
+        self._error = None
+        import asyncio
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="broadcast", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        import asyncio
+        async def shutdown():
+            self._server.close()
+            for client in list(self.clients):
+                client.transport.close() # Ends each viewer's read loop
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self):
+        import asyncio
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(asyncio.start_server(
+                self._serve_client, self.host, self.port, backlog=1024)) # A whole class may connect at once
+        except OSError as error:
+            self._error = error
+            self._ready.set()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def publish(self, state):
+        """Hands a captured state (params, angles, info, clock) to the server thread."""
+        self._loop.call_soon_threadsafe(self._publish, state)
+
+    def _publish(self, state):
+        frame = self.latest = self.encoder.encode(state)
+        self.frames += 1
+        for client in self.clients:
+            if client.transport.get_write_buffer_size() <= BROADCAST_HIGH_WATER:
+                self._send(client, frame) # Otherwise still draining older frames: skip this one
+        self.encode_time += frame.encode_time # Includes a keyframe built on demand by _send
+
+    def _send(self, client, frame):
+        if client.transport.is_closing():
+            return
+        if client.sent is not None and frame.seq > client.sent + 1:
+            self.dropped += frame.seq - client.sent - 1
+        if client.sent == frame.seq - 1 and frame.delta is not None:
+            payload = frame.delta
+        else:
+            payload = frame.keyframe()
+            self.keyframes_sent += 1
+        client.transport.write(payload)
+        self.bytes_sent += len(payload)
+        client.sent = frame.seq
+
+    def thread_cpu_time(self):
+        """CPU seconds used by the server thread so far."""
+        import asyncio
+        async def cpu_time(): return time.thread_time()
+        return asyncio.run_coroutine_threadsafe(cpu_time(), self._loop).result()
+
+    async def _serve_client(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, BROADCAST_SEND_BUFFER) # Bounds how stale queued frames get
+        client = BroadcastClient(writer.transport)
+        self.clients.add(client)
+        if self.latest is not None:
+            self._send(client, self.latest)
+        try:
+            while await reader.read(4096): # Viewers send nothing; this returns at disconnect
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+class BroadcastViewer(QObject):
+    """Receives frames on an asyncio thread and shows the newest one in an ExchangeAnimator (--view)."""
+    frame_ready = pyqtSignal()
+    status_changed = pyqtSignal(str)
+
+    def __init__(self, window, host, port):
+        super().__init__(window)
+        self.window = window
+        self.host, self.port = host, port
+        self.frames = 0
+        self.resyncs = 0 # Deltas discarded while waiting for a keyframe
+        self._latest = None
+        self._lock = threading.Lock()
+        self.frame_ready.connect(self.apply_latest, Qt.QueuedConnection)
+        self.status_changed.connect(lambda status: window.setWindowTitle(f"Exchange Interaction Animator (viewer: {status})"))
+        self._thread = threading.Thread(target=self._run, name="viewer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        import asyncio
+        asyncio.run(self._receive())
+
+    async def _receive(self):
+        import asyncio
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                self.status_changed.emit(f"waiting for {self.host}:{self.port}")
+                await asyncio.sleep(BROADCAST_RETRY_INTERVAL)
+                continue
+            self.status_changed.emit(f"{self.host}:{self.port}")
+            decoder = BroadcastDecoder()
+            try:
+                while True:
+                    state = decoder.decode(await read_broadcast_message(reader))
+                    if state is None:
+                        self.resyncs += 1
+                        continue
+                    self.frames += 1
+                    with self._lock:
+                        pending, self._latest = self._latest is not None, state
+                    if not pending: self.frame_ready.emit()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                writer.close()
+                self.status_changed.emit(f"disconnected from {self.host}:{self.port}")
+                await asyncio.sleep(BROADCAST_RETRY_INTERVAL)
+
+    def apply_latest(self):
+        with self._lock:
+            state, self._latest = self._latest, None
+        if state is not None:
+            self.window.apply_broadcast_state(state)
+
+def parse_address(text, default_host='127.0.0.1'):
+    """'HOST:PORT', ':PORT' or 'PORT' → (host, port)."""
+    host, _, port = text.rpartition(':')
+    return host or default_host, int(port)
+
+def run_load_clients(host, port, count, duration, queue):
+    """Runs count simulated viewers for duration seconds in a separate process; puts their totals on queue."""
+    import asyncio
+    totals = {'connected': 0, 'messages': 0, 'keyframes': 0, 'bytes': 0, 'resyncs': 0}
+
+    async def client(index):
+        slow = index % LOAD_TEST_SLOW_EVERY == LOAD_TEST_SLOW_EVERY - 1
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if slow: sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096) # Before connecting, so the window stays small
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (host, port))
+        reader, writer = await asyncio.open_connection(sock=sock, limit=1024 if slow else 2**16)
+        totals['connected'] += 1
+        decoder = BroadcastDecoder()
+        try:
+            while True:
+                body = await read_broadcast_message(reader)
+                totals['messages'] += 1
+                totals['bytes'] += len(body) + BROADCAST_LENGTH.size
+                totals['keyframes'] += body[:1] == b'K'
+                if decoder.decode(body) is None: totals['resyncs'] += 1
+                if slow: await asyncio.sleep(LOAD_TEST_SLOW_READ_INTERVAL)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        tasks = [asyncio.ensure_future(client(index)) for index in range(count)]
+        await asyncio.sleep(duration)
+        for task in tasks: task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(main())
+    queue.put(totals)
+
+def run_load_test(clients, duration, host='127.0.0.1'):
+    """Publishes a live spin-chain state to growing numbers of simulated viewers; returns (results, failures)."""
+    server = BroadcastServer(host, 0).start()
+    chain = LLGChain(CHAIN_STRIP_SPINS)
+    chain.seed_spin_wave(0.25)
+    chain.m[:2] += 0.02 * np.random.default_rng(0).standard_normal((2, CHAIN_STRIP_SPINS)) # Thermal noise: realistic frame sizes
+    chain.m /= np.linalg.norm(chain.m, axis=0)
+    params = {'tab': 1, 'j2_slider': 100, 's2_slider': 10, 'a2_slider': 100, 'k2_slider': 25, 'damping2_slider': 0}
+    frame_dt = 1.0 / BROADCAST_FPS
+    def publish():
+        chain.step(frame_dt * 0.5)
+        info = {'two_spin': [1.0, 1.0], 'chain': [chain.time, chain.measured_omega, GRID_SPACING]}
+        server.publish((dict(params), pack_spin_angles(0.0, chain.m), info, time.perf_counter() - START_TIME))
+    import multiprocessing
+    context = multiprocessing.get_context('spawn')
+    stages = sorted({count for count in (1, 10, 100, clients) if count <= clients})
+    print(f"{'clients':>8} {'frames':>7} {'CPU %':>7} {'CPU ms/frame':>13} {'encode ms/frame':>16} "
+          f"{'B/viewer/frame':>15} {'keyframes':>10} {'dropped':>8} {'resyncs':>8}")
+    results = []
+    for count in stages:
+        queue = context.Queue()
+        process = context.Process(target=run_load_clients, args=(host, server.port, count, duration + 3.0, queue))
+        process.start()
+        deadline = time.monotonic() + 30.0
+        while len(server.clients) < count and time.monotonic() < deadline:
+            publish()
+            time.sleep(frame_dt)
+        counters = (server.frames, server.bytes_sent, server.keyframes_sent, server.dropped, server.encode_time)
+        cpu_start, start = server.thread_cpu_time(), time.perf_counter()
+        next_frame = start
+        while time.perf_counter() - start < duration:
+            params['k2_slider'] = 25 + int(time.perf_counter() - start) % 5 # An occasional control change
+            publish()
+            next_frame += frame_dt
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+        cpu = server.thread_cpu_time() - cpu_start
+        elapsed = time.perf_counter() - start
+        frames, sent, keyframes, dropped, encode = (now - before for now, before in zip(
+            (server.frames, server.bytes_sent, server.keyframes_sent, server.dropped, server.encode_time), counters))
+        totals = queue.get()
+        process.join()
+        row = {'clients': count, 'connected': totals['connected'], 'frames': frames, 'cpu_percent': 100.0 * cpu / elapsed,
+               'cpu_ms_per_frame': 1e3 * cpu / max(frames, 1), 'encode_ms_per_frame': 1e3 * encode / max(frames, 1),
+               'bytes_per_viewer_frame': sent / max(frames * count, 1),
+               'keyframes': keyframes, 'dropped': dropped, 'resyncs': totals['resyncs']}
+        results.append(row)
+        print(f"{count:>8} {frames:>7} {row['cpu_percent']:>7.1f} {row['cpu_ms_per_frame']:>13.3f} {row['encode_ms_per_frame']:>16.3f} "
+              f"{row['bytes_per_viewer_frame']:>15.0f} {keyframes:>10} {dropped:>8} {totals['resyncs']:>8}")
+    server.stop()
+    # Encoding is shared by all viewers and must stay flat; every viewer still costs one write per frame
+    first, last = results[0], results[-1]
+    viewer_us = 1e3 * (last['cpu_ms_per_frame'] - first['cpu_ms_per_frame']) / max(last['clients'] - first['clients'], 1)
+    failures = []
+    if last['encode_ms_per_frame'] > LOAD_TEST_MAX_ENCODE_GROWTH * first['encode_ms_per_frame']:
+        failures.append(f"encode CPU grew from {first['encode_ms_per_frame']:.3f} to {last['encode_ms_per_frame']:.3f} ms/frame "
+                        f"(limit {LOAD_TEST_MAX_ENCODE_GROWTH:g}x)")
+    if viewer_us > LOAD_TEST_MAX_VIEWER_US:
+        failures.append(f"each viewer costs {viewer_us:.1f} µs of server CPU per frame (limit {LOAD_TEST_MAX_VIEWER_US:g} µs)")
+    if any(row['connected'] < row['clients'] for row in results):
+        failures.append("not every simulated viewer connected")
+    if len(results) > 1:
+        print(f"Server CPU per frame grows by {viewer_us:.1f} µs per viewer (the writes) on top of a flat "
+              f"{last['encode_ms_per_frame']:.3f} ms encode: about {1e6 / (BROADCAST_FPS * max(viewer_us, 1e-3)):,.0f} "
+              f"viewers fill one core at {BROADCAST_FPS} fps.")
+    print("PASS" if not failures else "FAIL: " + "; ".join(failures))
+    return results, failures
+
 # =============================================================================
 # Main Execution Block
 # =============================================================================
 if __name__ == '__main__':
+    # --- Command Line Options (unrecognised arguments are passed on to Qt) ---
+    parser = argparse.ArgumentParser(description="Exchange Interaction Animator")
+    parser.add_argument("--fps", type=float, default=TARGET_FPS, help="Target frame rate of the animation clock")
+    parser.add_argument("--sweep", choices=sorted(SWEEP_KINDS), help="Write a parameter-sweep table instead of opening the GUI")
+    for name, default in SWEEP_DEFAULT_AXES.items():
+        parser.add_argument(f"--{name}", dest=f"axis_{name}", default=default, metavar="START:STOP:NUM|V1,V2,...",
+                            help=f"Sweep values of {name}" + (" (units of π/a)" if name == 'k' else ""))
+    parser.add_argument("--output", help="Sweep output file, .npz or .csv (default: sweep_<kind>.npz)")
+    parser.add_argument("--chunk-size", type=int, default=SWEEP_CHUNK_SIZE, help="Grid points per sweep chunk")
+    parser.add_argument("--workers", type=int, help="Processes used for large sweeps and frame export (default: CPU count)")
+    parser.add_argument("--export", choices=sorted(EXPORT_WIDGETS), help="Render an animation offscreen instead of opening the GUI")
+    parser.add_argument("--export-output", help="PNG sequence directory, or a .gif file (default: export_<kind>)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Length of the exported clip (or of each --load-test stage) in seconds")
+    parser.add_argument("--size", default="960x240", help="Exported frame size as WIDTHxHEIGHT")
+    parser.add_argument("--export-k", type=float, default=0.25, help="Spin-wave k of the exported chain (units of π/a)")
+    parser.add_argument("--plot-backend", choices=("matplotlib", "native"), default=PLOT_BACKEND,
+                        help="Plot renderer: Matplotlib figures or the lightweight native QPainter canvas")
+    parser.add_argument("--profile", action="store_true", help="Show the frame-time overlay at startup (F12 toggles it)")
+    parser.add_argument("--benchmark", nargs="?", const="benchmark.json", metavar="OUTPUT.json",
+                        help="Time scripted slider sweeps and animations offscreen and write percentiles to JSON")
+    parser.add_argument("--serve", type=int, nargs="?", const=BROADCAST_PORT, metavar="PORT",
+                        help=f"Stream this window's state to --view clients on PORT (default {BROADCAST_PORT}); "
+                             "only this machine can connect unless --host is given")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Interface --serve listens on (default 127.0.0.1). The stream is unauthenticated: "
+                             "pass --host 0.0.0.0 only on a network where every machine may watch it")
+    parser.add_argument("--view", nargs="?", const=f"127.0.0.1:{BROADCAST_PORT}", metavar="[HOST:]PORT",
+                        help="Follow the state streamed by a --serve instance instead of simulating locally")
+    parser.add_argument("--load-test", type=int, nargs="?", const=200, metavar="CLIENTS",
+                        help="Measure broadcast server CPU with up to CLIENTS simulated localhost viewers")
+    parser.add_argument("--verbose", action="store_true", help="Print diagnostics and startup timings")
+    args, qt_args = parser.parse_known_args()
+    VERBOSE = args.verbose
+    PLOT_BACKEND = args.plot_backend
+    startup = StartupTimer()
+    startup.mark("imports")
+    if not SCIPY_AVAILABLE: log("Note: SciPy not found. Domain-wall relaxation uses the NumPy tridiagonal fallback.")
+
+    # --- Batch Sweep Mode (no GUI) ---
+    if args.sweep:
+        axes = [parse_grid_spec(getattr(args, f"axis_{name}")) for name in SWEEP_KINDS[args.sweep][0]]
+        run_sweep(args.sweep, axes, args.output or f"sweep_{args.sweep}.npz", args.chunk_size, args.workers)
+        sys.exit(0)
+
+    # --- Offscreen Export Mode (no window) ---
+    if args.export:
+        export_app = QApplication(sys.argv[:1] + ['-platform', 'offscreen'] + qt_args)
+        width, height = (int(value) for value in args.size.lower().split('x'))
+        run_export(args.export, args.export_output or f"export_{args.export}", args.duration, args.fps,
+                   (width, height), args.export_k, args.workers)
+        sys.exit(0)
+
+    # --- Paint Benchmark (offscreen) ---
+    if args.benchmark:
+        benchmark_app = QApplication(sys.argv[:1] + ['-platform', 'offscreen'] + qt_args)
+        run_benchmark(args.benchmark, benchmark_app)
+        sys.exit(0)
+
+    # --- Broadcast Load Test (no GUI) ---
+    if args.load_test:
+        results, failures = run_load_test(args.load_test, args.duration)
+        sys.exit(1 if failures else 0)
+
     # --- Set High DPI Attributes BEFORE Creating QApplication ---
     # This MUST happen before 'app = QApplication(sys.argv)'
-    print("Setting High DPI Scaling Attributes...")
+    log("Setting High DPI Scaling Attributes...")
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-        print("  - AA_EnableHighDpiScaling set.")
+        log("  - AA_EnableHighDpiScaling set.")
     if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
         QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-        print("  - AA_UseHighDpiPixmaps set.")
+        log("  - AA_UseHighDpiPixmaps set.")
 
     # --- Create QApplication Instance ---
-    print("Creating QApplication...")
-    app = QApplication(sys.argv)
+    log("Creating QApplication...")
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
-    print("QApplication created.")
+    FrameScheduler.shared().set_target_fps(args.fps)
+    log("QApplication created.")
+    startup.mark("QApplication")
 
     # --- Create Main Window ---
-    print("Creating ExchangeAnimator window...")
-    window = ExchangeAnimator()
-    print("ExchangeAnimator window created.")
+    log("Creating ExchangeAnimator window...")
+    window = ExchangeAnimator(view_only=bool(args.view))
+    log("ExchangeAnimator window created.")
 
     # --- Patch Update Method (requires window instance) ---
     if hasattr(window, 'two_spin_widget'):
-        print("Patching update method for TwoSpinWidget...")
+        log("Patching update method for TwoSpinWidget...")
         window.setup_spin_widget_update_signal(window.two_spin_widget)
+    startup.mark("window construction")
 
     # --- Show Window ---
-    print("Showing window...")
+    log("Showing window...")
+    startup.watch_first_paint(window)
     window.show()
+    if args.profile: window.profiler_overlay.toggle()
+
+    # --- Classroom Broadcast ---
+    if args.serve is not None:
+        server = BroadcastServer(args.host, args.serve).start()
+        broadcast_timer = QTimer(window)
+        broadcast_timer.timeout.connect(lambda: server.publish(window.capture_broadcast_state()))
+        broadcast_timer.start(int(1000 / BROADCAST_FPS))
+        print(f"Broadcasting on {server.host}:{server.port}")
+    if args.view:
+        for index in (0, 1): window.ensure_tab_built(index) # The tabs whose spins are streamed; others build when shown
+        viewer = BroadcastViewer(window, *parse_address(args.view))
+        viewer.start()
 
     # --- Start Event Loop ---
-    print("Starting application event loop...")
+    log("Starting application event loop...")
     sys.exit(app.exec_())
@@ -0,0 +1,32 @@
+import importlib.util
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+MODULE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mag (2).py")
+spec = importlib.util.spec_from_file_location("mag", MODULE_PATH)
+mag = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mag)
+
+app = mag.QApplication.instance() or mag.QApplication(sys.argv[:1])
+
+
+def test_dash_dot_format_is_a_linestyle_not_a_marker():
+    assert mag.parse_plot_format('g-.') == ('green', None, '-.')
+    axes = mag.NativePlotCanvas().axes
+    axes.plot([0, 1], [0, 1], 'g-.')
+    plotted = axes.lines[-1]
+    assert plotted.marker is None
+    assert plotted.path is not None
+    assert plotted.pen.style() == mag.Qt.DashDotLine
+    assert plotted.color == mag.QColor('green')
+
+
+def test_point_marker_format():
+    assert mag.parse_plot_format('g.') == ('green', '.', None)
+    axes = mag.NativePlotCanvas().axes
+    axes.plot([0, 1], [0, 1], 'g.')
+    plotted = axes.lines[-1]
+    assert plotted.marker == '.'
+    assert plotted.path is None
+    assert plotted.color == mag.QColor('green')